@@ -0,0 +1,290 @@
+"""Пакетный поиск по многим запросам с общим пулом и общим лимитом запросов
+
+Все страницы и детали вакансий всех запросов идут через один пул потоков
+и один HHClient (общий лимит запросов в секунду). Запросы обходятся
+параллельно, а не друг за другом, и каждая вакансия загружается один раз,
+даже если ее нашли несколько запросов:
+
+    result = parser.get_vacancies_batch([
+        {"keyword": "python", "area": 1},
+        {"keyword": "django", "area": 2, "stop_words": "senior"},
+    ])
+    result.per_query["python_1"]   # DataFrame как у get_vacancies
+    result.merged                  # все вакансии один раз + столбец "Запросы"
+"""
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Union
+
+from text_matcher import VacancyMatcher
+from vacancy_record import VacancyRecord
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from hh_parser import HHParser
+
+
+class SearchQuery(NamedTuple):
+    keyword: str
+    area: int = 1
+    stop_words: Optional[Union[str, List[str]]] = None
+    schedules: Optional[Dict[str, bool]] = None
+    morphology: bool = False
+    with_salary: bool = False
+    experience: Optional[List[str]] = None
+    name: Optional[str] = None
+
+
+class BatchResult(NamedTuple):
+    per_query: Dict[str, "pd.DataFrame"]
+    merged: "pd.DataFrame"
+    stats: dict
+    # Имя запроса -> текст ошибки для запросов, выдачу которых не удалось загрузить
+    failed: Dict[str, str] = {}
+
+
+def query_names(queries: List[SearchQuery]) -> List[str]:
+    """Имена запросов: name или "<ключевое слово>_<регион>", повторы нумеруются"""
+    names, seen = [], {}
+    for query in queries:
+        name = query.name or f"{query.keyword}_{query.area}"
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    return names
+
+
+class _QueryState:
+    __slots__ = ("query", "matcher", "schedules", "total_pages", "pages", "error")
+
+    def __init__(self, query: SearchQuery, parser: HHParser):
+        self.query = query
+        self.matcher = VacancyMatcher(
+            query.keyword, parser._process_stop_words(query.stop_words), morphology=query.morphology
+        )
+        self.schedules = parser._selected_schedules(query.schedules)
+        self.total_pages = None
+        # Номер страницы -> ID прошедших фильтр вакансий в порядке выдачи
+        self.pages: Dict[int, List[str]] = {}
+        self.error: Optional[str] = None
+
+    def vacancy_ids(self) -> List[str]:
+        ids = {}
+        for page in sorted(self.pages):
+            ids.update(dict.fromkeys(self.pages[page]))
+        return list(ids)
+
+
+class BatchSearch:
+    """Один пакет запросов; parser дает клиент, кэш, хранилище и правила фильтрации
+
+    detail_fields - как у get_vacancies. progress_callback получает
+    (выполнено запросов к API, известно запросов на данный момент).
+    """
+
+    def __init__(self,
+                 parser: HHParser,
+                 detail_fields: Optional[List[str]] = None,
+                 progress_callback: Optional[Callable[[int, int], None]] = None):
+        self.parser = parser
+        self.detail_fields = detail_fields
+        self.progress_callback = progress_callback
+
+    def run(self, queries: List[Union[SearchQuery, dict]], typed: bool = False) -> BatchResult:
+        """Выполняет пакет; ошибка загрузки выдачи запроса не прерывает остальные запросы"""
+        parser = self.parser
+        queries = [query if isinstance(query, SearchQuery) else SearchQuery(**query) for query in queries]
+        states = [_QueryState(query, parser) for query in queries]
+        fetch_details = self.detail_fields is None or bool(self.detail_fields)
+        processor = parser.description_processor if fetch_details else None
+        # Полнотекстовый режим: до загрузки деталей проверяются только стоп-слова
+        full_text = processor is not None and processor.full_text
+        # Описания разбираются порциями по пачке на процесс, пока идут загрузки
+        flush_size = processor.batch_size * max(1, processor.workers) if processor is not None else 0
+
+        records: Dict[str, VacancyRecord] = {}
+        waiting_items: Dict[str, dict] = {}
+        # Описания, ожидающие разбора, и очищенные тексты для проверки ключевых слов запросов
+        descriptions: Dict[str, str] = {}
+        texts: Dict[str, str] = {}
+        pending = {}
+        stats = {"queries": len(queries), "pages": 0, "vacancies": 0, "details": 0, "shared": 0, "failed": 0}
+        done_count, total_count = 0, len(states)
+
+        with ThreadPoolExecutor(max_workers=parser.max_workers) as executor:
+            def submit_page(index: int, page: int):
+                query = states[index].query
+                future = executor.submit(
+                    parser._fetch_page, query.keyword, query.area, page, states[index].schedules
+                )
+                pending[future] = ("page", index, page)
+
+            for index in range(len(states)):
+                submit_page(index, 0)
+
+            try:
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        kind, key, page = pending.pop(future)
+                        if kind == "page":
+                            state = states[key]
+                            try:
+                                data = future.result()
+                            except Exception as e:
+                                total_count -= self._fail(state, key, e, pending)
+                                data = None
+                            if data is not None and state.error is None:
+                                stats["pages"] += 1
+                                if state.total_pages is None:
+                                    state.total_pages = data.get("pages", 1)
+                                    for next_page in range(1, state.total_pages):
+                                        submit_page(key, next_page)
+                                    total_count += max(0, state.total_pages - 1)
+                                for item in self._filter_page(state, data.get("items", []), full_text):
+                                    vacancy_id = str(item.get("id"))
+                                    state.pages.setdefault(page, []).append(vacancy_id)
+                                    if vacancy_id in records or vacancy_id in waiting_items:
+                                        stats["shared"] += 1
+                                    elif fetch_details:
+                                        waiting_items[vacancy_id] = item
+                                        pending[executor.submit(parser._get_vacancy_details, vacancy_id)] = (
+                                            "details", vacancy_id, None
+                                        )
+                                        total_count += 1
+                                    else:
+                                        records[vacancy_id] = VacancyRecord.from_payload(item)
+                        else:
+                            stats["details"] += 1
+                            details = future.result()
+                            if processor is not None and details.get("description"):
+                                descriptions[key] = details["description"]
+                            records[key] = self._make_record(waiting_items.pop(key), details)
+                            if processor is not None and len(descriptions) >= flush_size:
+                                self._process_descriptions(records, descriptions, texts, full_text)
+
+                        done_count += 1
+                        if self.progress_callback:
+                            self.progress_callback(done_count, total_count)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        if processor is not None:
+            self._process_descriptions(records, descriptions, texts, full_text)
+            if full_text:
+                self._match_full_text(states, records, texts)
+        parser._save_records(list(records.values()))
+        stats["vacancies"] = len(records)
+        stats["failed"] = sum(1 for state in states if state.error is not None)
+        return self._build_result(states, records, typed, stats)
+
+    def _fail(self, state: _QueryState, index: int, error: Exception, pending: dict) -> int:
+        """Помечает запрос неудавшимся и отменяет его еще не начатые страницы; возвращает число отмененных"""
+        state.error = str(error)
+        cancelled = [
+            future for future, (kind, key, _) in pending.items()
+            if kind == "page" and key == index and future.cancel()
+        ]
+        for future in cancelled:
+            del pending[future]
+        return len(cancelled)
+
+    def _filter_page(self, state: _QueryState, items: List[dict], full_text: bool = False) -> List[dict]:
+        parser = self.parser
+        query = state.query
+        with parser.metrics.timer("filter_seconds"):
+            matched = [item for item in items if parser._matches_fields(item, query.with_salary, query.experience)]
+            if full_text:
+                # Ключевое слово проверяется после разбора описаний (_match_full_text)
+                matched = [item for item in matched if not state.matcher.stop_word_found(parser._filter_text(item))]
+            else:
+                matched = [item for item in matched if parser._matches_filters(item, state.matcher)]
+        parser.metrics.inc("filter_items_total", len(items))
+        if not full_text:
+            parser.metrics.inc("filter_matched_total", len(matched))
+        return matched
+
+    def _make_record(self, item: dict, details: dict) -> VacancyRecord:
+        parser = self.parser
+        if parser.raw_buffer is not None:
+            parser.raw_buffer.put(item.get("id"), {**item, **details} if details else item)
+        if details and self.detail_fields is not None:
+            details = {field: details[field] for field in self.detail_fields if field in details}
+        record = VacancyRecord.from_payload(item, details, extra_fields=self.detail_fields)
+        if parser.description_processor is not None:
+            # Как в HHParser._process_descriptions: столбец навыков из описания есть у всех записей
+            record.extra = {**(record.extra or {}), "description_skills": []}
+        return record
+
+    def _process_descriptions(self,
+                              records: Dict[str, VacancyRecord],
+                              descriptions: Dict[str, str],
+                              texts: Dict[str, str],
+                              full_text: bool):
+        """Разбирает накопленные описания; тексты сохраняются для проверки ключевых слов запросов"""
+        parser = self.parser
+        processor = parser.description_processor
+        ids = list(descriptions)
+        with parser.metrics.timer("description_stage_seconds"):
+            results = processor.process(
+                [(descriptions[vacancy_id], parser._filter_text(records[vacancy_id])) for vacancy_id in ids],
+                keep_text=full_text or processor.keep_text
+            )
+        for vacancy_id, (skills, _, text) in zip(ids, results):
+            record = records[vacancy_id]
+            extra = dict(record.extra or {})
+            extra["description_skills"] = skills
+            if processor.keep_text:
+                extra["description_text"] = text
+            record.extra = extra
+            if full_text:
+                texts[vacancy_id] = text
+        descriptions.clear()
+
+    def _match_full_text(self,
+                         states: List[_QueryState],
+                         records: Dict[str, VacancyRecord],
+                         texts: Dict[str, str]):
+        """Оставляет в каждом запросе вакансии, где его ключевое слово есть в полном тексте
+
+        Без описания ключевое слово проверяется по названию и сниппету, как в HHParser.
+        """
+        parser = self.parser
+        matched_count = 0
+        for state in states:
+            for page, ids in state.pages.items():
+                state.pages[page] = [
+                    vacancy_id for vacancy_id in ids
+                    if (state.matcher.matches(f"{parser._filter_text(records[vacancy_id])} {texts[vacancy_id]}".lower())
+                        if vacancy_id in texts
+                        else parser._matches_filters(records[vacancy_id], state.matcher))
+                ]
+                matched_count += len(state.pages[page])
+        parser.metrics.inc("filter_matched_total", matched_count)
+
+    def _build_result(self,
+                      states: List[_QueryState],
+                      records: Dict[str, VacancyRecord],
+                      typed: bool,
+                      stats: dict) -> BatchResult:
+        parser = self.parser
+        names = query_names([state.query for state in states])
+        per_query, matched_by, failed = {}, {}, {}
+        for name, state in zip(names, states):
+            if state.error is not None:
+                failed[name] = state.error
+                continue
+            ids = state.vacancy_ids()
+            per_query[name] = parser._format_results([records[vacancy_id] for vacancy_id in ids], typed=typed)
+            for vacancy_id in ids:
+                matched_by.setdefault(vacancy_id, []).append(name)
+
+        merged = parser._format_results([records[vacancy_id] for vacancy_id in matched_by], typed=typed)
+        queries_column = list(matched_by.values())
+        if typed:
+            merged["queries"] = queries_column
+        else:
+            merged["Запросы"] = [", ".join(names) for names in queries_column]
+        return BatchResult(per_query, merged, stats, failed)
@@ -0,0 +1,122 @@
+"""Замер производительности парсера без обращения к настоящему API
+
+Поднимает mock_hh_api.MockHHServer и прогоняет основные этапы:
+поиск (get_vacancies), загрузку по ID (get_vacancies_by_ids) и
+форматирование (_format_results). Для каждого этапа выводится время,
+число запросов, запросов/с, вакансий/с и пиковая память Python.
+
+    python benchmark.py --vacancies 2000 --latency 0.05 --workers 8 --rate 50
+    python benchmark.py --error-rate 0.05 --max-rps 20 --json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+from hh_parser import HHParser
+from mock_hh_api import MockHHServer, make_vacancy_details
+
+
+def measure(name: str,
+            func: Callable[[], int],
+            server: Optional[MockHHServer] = None,
+            trace_memory: bool = True) -> dict:
+    """Выполняет этап и возвращает его показатели; func возвращает число вакансий
+
+    tracemalloc заметно замедляет Python-код, поэтому для чистых замеров
+    скорости его можно отключить (peak_memory_mb будет пустым).
+    """
+    if server:
+        server.reset_stats()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    vacancies = func()
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    stats = dict(server.stats) if server else {}
+    requests_count = stats.get("requests", 0)
+    return {
+        "stage": name,
+        "seconds": round(elapsed, 3),
+        "vacancies": vacancies,
+        "vacancies_per_sec": round(vacancies / elapsed, 1) if elapsed else None,
+        "requests": requests_count,
+        "requests_per_sec": round(requests_count / elapsed, 1) if elapsed and server else None,
+        "throttled": stats.get("throttled", 0),
+        "errors": stats.get("errors", 0),
+        "peak_memory_mb": round(peak / 2 ** 20, 1) if peak is not None else None
+    }
+
+
+def run(args) -> List[dict]:
+    results = []
+    trace_memory = not args.no_memory
+    with MockHHServer(vacancies=args.vacancies, latency=args.latency, error_rate=args.error_rate,
+                      max_rps=args.max_rps, retry_after=args.retry_after) as server:
+        parser = HHParser(max_workers=args.workers, rate_limit=args.rate)
+        parser.base_url = server.base_url
+
+        results.append(measure(
+            "get_vacancies", lambda: len(parser.get_vacancies(args.keyword)), server, trace_memory
+        ))
+        ids = [str(vacancy_id) for vacancy_id in range(min(args.ids, args.vacancies))]
+        results.append(measure(
+            "get_vacancies_by_ids", lambda: len(parser.get_vacancies_by_ids(ids)), server, trace_memory
+        ))
+
+    vacancies = [make_vacancy_details(vacancy_id) for vacancy_id in range(args.format_rows)]
+    results.append(measure(
+        "_format_results", lambda: len(parser._format_results(vacancies)), trace_memory=trace_memory
+    ))
+    results.append(measure(
+        "_format_results typed", lambda: len(parser._format_results(vacancies, typed=True)),
+        trace_memory=trace_memory
+    ))
+    return results
+
+
+def print_table(results: List[dict]):
+    columns = ["stage", "seconds", "vacancies", "vacancies_per_sec", "requests", "requests_per_sec",
+               "throttled", "errors", "peak_memory_mb"]
+    rows = [[str(result[column] if result[column] is not None else "-") for column in columns]
+            for result in results]
+    widths = [max(len(column), *(len(row[index]) for row in rows)) for index, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Бенчмарк HHParser на локальном mock API")
+    arg_parser.add_argument("--keyword", default="python")
+    arg_parser.add_argument("--vacancies", type=int, default=1000, help="вакансий на сервере")
+    arg_parser.add_argument("--ids", type=int, default=300, help="вакансий для get_vacancies_by_ids")
+    arg_parser.add_argument("--format-rows", type=int, default=20000, help="вакансий для _format_results")
+    arg_parser.add_argument("--latency", type=float, default=0.02, help="задержка ответа сервера, с")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов 500")
+    arg_parser.add_argument("--max-rps", type=float, default=None, help="лимит сервера (иначе без 429)")
+    arg_parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After в ответах 429")
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--rate", type=float, default=100.0, help="лимит клиента, запросов/с")
+    arg_parser.add_argument("--no-memory", action="store_true", help="не замерять память (точнее скорость)")
+    arg_parser.add_argument("--json", action="store_true", help="вывести результаты в JSON")
+    args = arg_parser.parse_args(argv)
+
+    results = run(args)
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_table(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
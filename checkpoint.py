@@ -0,0 +1,83 @@
+import json
+import os
+import time
+from typing import Optional, List, Set
+
+
+class CrawlCheckpoint:
+    """Состояние поиска в файле JSONL: заголовок с параметрами запроса и по строке на страницу
+
+    Страницы дописываются в конец файла, поэтому сохранение не зависит от
+    объема уже собранных данных, а оборванная последняя строка просто
+    отбрасывается при загрузке.
+    """
+
+    def __init__(self, path: str, query: dict, max_age: float = 12 * 3600):
+        self.path = path
+        self.query = query
+        self.max_age = max_age
+        self.next_page = 0
+        self.total_pages: Optional[int] = None
+        self.processed_ids: Set[str] = set()
+        self.records: List[dict] = []
+        # Компактные исходные данные вакансий (для файла-спутника), если они сохранялись
+        self.raw: List[dict] = []
+
+    def load(self) -> bool:
+        """Загружает сохраненное состояние, если оно относится к тому же запросу и не устарело"""
+        if not os.path.exists(self.path):
+            return False
+
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            return False
+        if header.get("query") != self.query or time.time() - header.get("created_at", 0) > self.max_age:
+            return False
+
+        for line in lines[1:]:
+            try:
+                page_state = json.loads(line)
+            except ValueError:
+                break
+            self.next_page = page_state["page"] + 1
+            self.total_pages = page_state["total_pages"]
+            self.processed_ids.update(page_state["ids"])
+            self.records.extend(page_state["records"])
+            self.raw.extend(page_state.get("raw", []))
+        return True
+
+    def start(self):
+        """Начинает новый файл состояния для текущего запроса"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"query": self.query, "created_at": time.time()}, ensure_ascii=False) + "\n")
+
+    def save_page(self,
+                  page: int,
+                  total_pages: int,
+                  ids: List[str],
+                  records: List[dict],
+                  raw: Optional[List[dict]] = None):
+        """Дописывает завершенную страницу; raw - компактные исходные данные ее вакансий"""
+        self.next_page = page + 1
+        self.total_pages = total_pages
+        self.processed_ids.update(ids)
+        page_state = {
+            "page": page,
+            "total_pages": total_pages,
+            "ids": ids,
+            "records": records
+        }
+        if raw is not None:
+            page_state["raw"] = raw
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(page_state, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self):
+        """Удаляет файл состояния после успешного завершения поиска"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,204 @@
+"""Поиск почти одинаковых вакансий (перепубликации, копии в разных регионах)
+
+Текст вакансии разбивается на шинглы из shingle_size слов, для каждого
+набора считается MinHash-подпись из num_perm значений. Подписи режутся на
+полосы (LSH): кандидатами считаются вакансии одного работодателя, у которых
+совпала хотя бы одна полоса, и только для них оценивается сходство по доле
+совпавших значений подписи. Так не нужно сравнивать все пары - работа
+растет почти линейно с числом вакансий.
+
+    duplicates = find_duplicates(vacancies, threshold=0.8)   # {id копии: id оставленной}
+    df = deduplicate_frame(parser.get_vacancies("python"))
+"""
+import re
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Простое число Мерсенна: хэши шинглов и коэффициенты меньше него, произведение влезает в uint64
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r'\w+')
+_TAG = re.compile(r'<[^>]+>')
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(полос, строк в полосе), при которых порог срабатывания LSH ближе всего к threshold"""
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def vacancy_text(vacancy: dict) -> str:
+    """Текст сырой вакансии для сравнения: название, сниппет, навыки и описание без тегов"""
+    snippet = vacancy.get("snippet") or {}
+    skills = " ".join(skill.get("name") or "" for skill in vacancy.get("key_skills") or [])
+    description = _TAG.sub(" ", vacancy.get("description") or "")
+    return " ".join([
+        vacancy.get("name") or "",
+        snippet.get("requirement") or "",
+        snippet.get("responsibility") or "",
+        skills,
+        description
+    ])
+
+
+def _employer(vacancy: dict) -> Optional[str]:
+    employer = vacancy.get("employer") or {}
+    value = employer.get("id") or employer.get("name")
+    return str(value) if value else None
+
+
+class MinHashLSH:
+    """Индекс MinHash-подписей с разбиением на полосы
+
+    threshold - минимальное оценочное сходство Жаккара по шинглам, при
+    котором вакансии считаются копиями. same_employer=False сравнивает
+    вакансии разных работодателей (вакансии без работодателя всегда
+    сравниваются только между собой).
+    """
+
+    def __init__(self,
+                 threshold: float = 0.8,
+                 num_perm: int = 128,
+                 shingle_size: int = 3,
+                 same_employer: bool = True,
+                 seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError("Порог сходства должен быть в диапазоне (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.same_employer = same_employer
+        self.bands, self.rows = _optimal_bands(threshold, num_perm)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[tuple, List[str]] = {}
+
+    def signature(self, text: str) -> np.ndarray:
+        words = _WORD.findall(text.lower())
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) % _PRIME for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def query_add(self,
+                  key: str,
+                  employer: Optional[str],
+                  text: str,
+                  root: Optional[Callable[[str], str]] = None) -> List[Tuple[str, float]]:
+        """Добавляет вакансию и возвращает уже добавленные похожие: [(ключ, сходство)]
+
+        root - группа уже найденных копий для ключа (корень union-find): в
+        каждой полосе и среди кандидатов остается по одному ключу на группу,
+        поэтому сотни копий одной вакансии не сравниваются с каждой новой.
+        """
+        signature = self.signature(text)
+        group = (employer or "") if self.same_employer or not employer else None
+        candidates = set()
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            bucket = self._buckets.setdefault((group, band, chunk), [])
+            if root is not None and len(bucket) > 1:
+                representatives = {}
+                for member in bucket:
+                    representatives.setdefault(root(member), member)
+                bucket[:] = representatives.values()
+            candidates.update(bucket)
+            bucket.append(key)
+        self._signatures[key] = signature
+        if root is not None:
+            candidates = {root(candidate): candidate for candidate in candidates}.values()
+
+        similar = []
+        for candidate in candidates:
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= self.threshold:
+                similar.append((candidate, similarity))
+        return similar
+
+
+def find_duplicates(vacancies: Iterable[dict],
+                    threshold: float = 0.8,
+                    canonical_key: Optional[Callable[[dict], tuple]] = None,
+                    **lsh_options) -> Dict[str, str]:
+    """Находит группы почти одинаковых вакансий; возвращает {id копии: id оставленной вакансии}
+
+    Из группы остается вакансия с наибольшим canonical_key (по умолчанию
+    самая свежая по published_at). lsh_options передаются в MinHashLSH.
+    """
+    canonical_key = canonical_key or (lambda vacancy: (vacancy.get("published_at") or "", ))
+    items = [(str(vacancy.get("id")), _employer(vacancy), vacancy_text(vacancy), canonical_key(vacancy))
+             for vacancy in vacancies]
+    return _cluster(items, threshold, lsh_options)
+
+
+def deduplicate(vacancies: List[dict], threshold: float = 0.8, **options) -> List[dict]:
+    """Сырые вакансии без почти одинаковых копий (порядок сохраняется)"""
+    duplicates = find_duplicates(vacancies, threshold, **options)
+    return [vacancy for vacancy in vacancies if str(vacancy.get("id")) not in duplicates]
+
+
+def deduplicate_frame(df: pd.DataFrame, threshold: float = 0.8, **lsh_options) -> pd.DataFrame:
+    """То же для DataFrame HHParser: обычного (русские столбцы) или типизированного
+
+    Сравниваются название, сниппет и навыки; остается самая свежая вакансия группы.
+    """
+    if df.empty:
+        return df
+    if "id" in df.columns:
+        ids, employers = df["id"], df["employer"]
+        skills = df["skills"].map(lambda value: " ".join(value) if isinstance(value, list) else "")
+        texts = df["name"].fillna("") + " " + df["snippet"].fillna("") + " " + skills
+        dates = df["published_at"].astype(str)
+    elif "Ссылка" in df.columns:
+        ids, employers = df["Ссылка"], df["Компания"]
+        texts = df["Вакансия"].fillna("") + " " + df["Описание"].fillna("") + " " + df["Ключевые навыки"].fillna("")
+        dates = df["Дата публикации"].astype(str)
+    else:
+        raise ValueError("В данных нет столбцов для поиска дубликатов")
+
+    items = list(zip(ids.astype(str), employers, texts, ((date,) for date in dates)))
+    duplicates = _cluster(items, threshold, lsh_options)
+    return df[~ids.astype(str).isin(duplicates)].reset_index(drop=True)
+
+
+def _cluster(items: List[tuple], threshold: float, lsh_options: dict) -> Dict[str, str]:
+    """items: (ключ, работодатель, текст, ключ выбора оставляемой записи)"""
+    lsh = MinHashLSH(threshold=threshold, **lsh_options)
+    parent = {}
+
+    def root(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    rank = {}
+    for key, employer, text, order in items:
+        if key in parent:
+            continue
+        parent[key] = key
+        rank[key] = order
+        for other, _ in lsh.query_add(key, employer if isinstance(employer, str) else None, text, root=root):
+            parent[root(other)] = root(key)
+
+    groups = {}
+    for key in parent:
+        groups.setdefault(root(key), []).append(key)
+
+    duplicates = {}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        canonical = max(members, key=lambda key: rank[key])
+        duplicates.update((key, canonical) for key in members if key != canonical)
+    return duplicates
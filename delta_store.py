@@ -0,0 +1,49 @@
+import hashlib
+import json
+import os
+from typing import Optional, List, Tuple
+
+
+class DeltaStore:
+    """Хранит для повторяющихся запросов дату последней публикации и накопленные вакансии
+
+    Для каждого запроса в каталоге лежат два файла: <ключ>.meta.json
+    с параметрами и водяным знаком published_at и <ключ>.jsonl с записями.
+    """
+
+    def __init__(self, directory: str = "delta_state"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, query: dict) -> Tuple[Optional[str], List[dict]]:
+        """Возвращает (водяной знак, сохраненные записи) для запроса"""
+        meta_path, records_path = self._paths(query)
+        if not os.path.exists(meta_path) or not os.path.exists(records_path):
+            return None, []
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(records_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return meta.get("watermark"), records
+
+    def save(self, query: dict, watermark: Optional[str], records: List[dict]):
+        meta_path, records_path = self._paths(query)
+        # Сначала записи, потом метаданные: при сбое водяной знак не опередит данные
+        self._write_atomic(records_path, "".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        ))
+        self._write_atomic(meta_path, json.dumps(
+            {"query": query, "watermark": watermark}, ensure_ascii=False, indent=2
+        ))
+
+    def _paths(self, query: dict) -> Tuple[str, str]:
+        key = hashlib.sha1(json.dumps(query, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+        base = os.path.join(self.directory, key)
+        return f"{base}.meta.json", f"{base}.jsonl"
+
+    def _write_atomic(self, path: str, content: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
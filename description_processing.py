@@ -0,0 +1,161 @@
+"""Обработка полных HTML-описаний вакансий в пуле процессов
+
+Многие работодатели не заполняют key_skills, но перечисляют технологии в
+описании. DescriptionProcessor переводит HTML-описание в текст, находит в
+нем навыки по словарю и проверяет ключевое слово и стоп-слова по полному
+тексту, а не только по сниппету. Разбор текста упирается в процессор,
+поэтому описания обрабатываются пачками в ProcessPoolExecutor.
+
+    with DescriptionProcessor(skills=load_skill_dictionary("skills.json")) as processor:
+        parser = HHParser(description_processor=processor)
+        df = parser.get_vacancies("python")   # + столбец "Навыки из описания"
+
+Файл словаря - JSON вида {"PostgreSQL": ["postgres", "постгрес"], ...};
+название навыка тоже считается синонимом.
+"""
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from text_matcher import VacancyMatcher
+
+DEFAULT_SKILLS = {
+    "Python": [], "Django": [], "FastAPI": [], "Flask": [], "asyncio": [], "Celery": [],
+    "pandas": [], "NumPy": [], "Go": ["golang"], "Java": [], "Kotlin": [], "Scala": [],
+    "JavaScript": ["js"], "TypeScript": [], "React": ["react.js", "reactjs"], "Vue.js": ["vue", "vuejs"],
+    "Node.js": ["nodejs", "node"], "PHP": [], "C++": [], "C#": [], ".NET": [], "1С": ["1c"],
+    "SQL": [], "PostgreSQL": ["postgres", "постгрес"], "MySQL": [], "ClickHouse": [], "MongoDB": ["mongo"],
+    "Redis": [], "Elasticsearch": ["elastic"], "Kafka": [], "RabbitMQ": [], "Airflow": [], "Spark": ["pyspark"],
+    "Hadoop": [], "Docker": [], "Kubernetes": ["k8s"], "Helm": [], "Terraform": [], "Ansible": [],
+    "Linux": [], "Nginx": [], "Git": [], "CI/CD": [], "GitLab CI": [], "Jenkins": [], "AWS": [],
+    "REST API": ["rest"], "GraphQL": [], "gRPC": [], "Grafana": [], "Prometheus": [], "Jira": []
+}
+
+_BLOCK_TAG = re.compile(r'<\s*(?:br|/p|/li|/div|/h\d|/ul|/ol|/tr)\b[^>]*>', re.IGNORECASE)
+_TAG = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'[ \t\r\f\v\xa0]+')
+_NEWLINES = re.compile(r' ?\n[\n ]*')
+
+
+def html_to_text(value: Optional[str]) -> str:
+    """HTML описания -> текст: блоки с новой строки, сущности раскрыты, пробелы схлопнуты"""
+    if not value:
+        return ""
+    text = html.unescape(_TAG.sub(" ", _BLOCK_TAG.sub("\n", value)))
+    return _NEWLINES.sub("\n", _SPACES.sub(" ", text)).strip()
+
+
+def load_skill_dictionary(path: str) -> Dict[str, List[str]]:
+    with open(path, encoding="utf-8") as f:
+        skills = json.load(f)
+    if not isinstance(skills, dict):
+        raise ValueError("Словарь навыков должен быть JSON-объектом {навык: [синонимы]}")
+    return {str(skill): [str(alias) for alias in aliases or []] for skill, aliases in skills.items()}
+
+
+class SkillExtractor:
+    """Все синонимы всех навыков ищутся одним регулярным выражением"""
+
+    def __init__(self, skills: Dict[str, List[str]]):
+        self.aliases = {}
+        for skill, aliases in skills.items():
+            for alias in [skill, *aliases]:
+                self.aliases.setdefault(alias.lower(), skill)
+        alternatives = sorted((re.escape(alias) for alias in self.aliases), key=len, reverse=True)
+        # \b не подходит для "c++", "c#" и ".net": границы задаются явно
+        self.pattern = re.compile(rf'(?<![\w.+#])(?:{"|".join(alternatives)})(?![\w+#])') if alternatives else None
+
+    def extract(self, text: str) -> List[str]:
+        """Навыки в порядке первого упоминания, без повторов"""
+        if not self.pattern:
+            return []
+        found = {}
+        for match in self.pattern.finditer(text.lower()):
+            found.setdefault(self.aliases[match.group(0)], None)
+        return list(found)
+
+
+# Состояние процесса-обработчика: словарь компилируется один раз на процесс
+_extractor: Optional[SkillExtractor] = None
+
+
+def _init_worker(skills: Dict[str, List[str]]):
+    global _extractor
+    _extractor = SkillExtractor(skills)
+
+
+def _process_batch(batch: List[Tuple[str, str]],
+                   matcher: Optional[VacancyMatcher],
+                   keep_text: bool) -> List[tuple]:
+    """batch: (HTML-описание, название и сниппет); результат: (навыки, совпадение, текст)"""
+    results = []
+    for description, prefix in batch:
+        text = html_to_text(description)
+        matched = matcher.matches(f"{prefix} {text}".lower()) if matcher else None
+        results.append((_extractor.extract(text), matched, text if keep_text else None))
+    return results
+
+
+class DescriptionProcessor:
+    """Пул процессов для разбора описаний; один на много поисков, закрывается через close()
+
+    workers=0 - обрабатывать в текущем процессе (для небольших объемов и отладки).
+    full_text=True - HHParser проверяет ключевое слово по полному описанию: детали
+    загружаются для всех вакансий страницы без стоп-слов в названии и сниппете,
+    а лишние отбрасываются после разбора.
+    keep_text=True - сохранять очищенный текст в записи (поле description_text).
+    """
+
+    def __init__(self,
+                 skills: Optional[Dict[str, List[str]]] = None,
+                 workers: Optional[int] = None,
+                 batch_size: int = 25,
+                 full_text: bool = True,
+                 keep_text: bool = False):
+        self.skills = skills if skills is not None else DEFAULT_SKILLS
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = max(1, batch_size)
+        self.full_text = full_text
+        self.keep_text = keep_text
+        self._executor = None
+        if self.workers:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.skills,)
+            )
+        else:
+            _init_worker(self.skills)
+
+    def process(self,
+                items: List[Tuple[str, str]],
+                matcher: Optional[VacancyMatcher] = None,
+                keep_text: Optional[bool] = None) -> List[tuple]:
+        """items: (HTML-описание, название и сниппет); порядок результатов совпадает с items
+
+        keep_text - вернуть очищенный текст независимо от настройки процессора
+        (нужно, когда ключевое слово проверяется позже, например для пакета запросов).
+        """
+        if not items:
+            return []
+        keep_text = self.keep_text if keep_text is None else keep_text
+        batches = [items[start:start + self.batch_size] for start in range(0, len(items), self.batch_size)]
+        if self._executor is None:
+            results = (_process_batch(batch, matcher, keep_text) for batch in batches)
+        else:
+            results = self._executor.map(
+                _process_batch, batches, [matcher] * len(batches), [keep_text] * len(batches)
+            )
+        return [result for batch in results for result in batch]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
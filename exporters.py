@@ -0,0 +1,198 @@
+"""Потоковая запись результатов в файлы
+
+Писатель открывается один раз и принимает DataFrame-порции по мере
+поступления (например, из HHParser.iter_vacancies(as_frames=True)), не
+требуя собирать весь результат в памяти:
+
+    with open_writer("вакансии.parquet") as writer:
+        for chunk in parser.iter_vacancies("python", as_frames=True):
+            writer.write(chunk)
+
+Поддерживаются csv, jsonl (ndjson), parquet, feather и xlsx. Для parquet
+и feather нужен pyarrow, для xlsx - openpyxl.
+"""
+import os
+from typing import Iterable, Optional
+
+import pandas as pd
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".xlsx": "xlsx",
+}
+
+
+class ChunkWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+
+    def write(self, chunk: pd.DataFrame):
+        if chunk.empty:
+            return
+        self._write(chunk)
+        self.rows += len(chunk)
+
+    def _write(self, chunk: pd.DataFrame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvWriter(ChunkWriter):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+
+    def _write(self, chunk: pd.DataFrame):
+        chunk.to_csv(self._file, header=self.rows == 0, index=False)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlWriter(ChunkWriter):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write(self, chunk: pd.DataFrame):
+        text = chunk.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+        self._file.write(text if text.endswith("\n") else text + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class _ArrowWriter(ChunkWriter):
+    """Общая часть для parquet и feather: схема фиксируется по первой порции"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Для сохранения в parquet/feather установите pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._writer = None
+        self._schema = None
+
+    def _write(self, chunk: pd.DataFrame):
+        pa = self._pa
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._schema is None:
+            # Столбец без значений в первой порции считаем строковым
+            self._schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            ])
+            self._writer = self._open(self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def _open(self, schema):
+        raise NotImplementedError
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ParquetWriter(_ArrowWriter):
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(self.path, schema, compression="zstd")
+
+
+class FeatherWriter(_ArrowWriter):
+    def _open(self, schema):
+        # Feather v2 - это файл Arrow IPC, который пишется по порциям
+        import pyarrow.ipc as ipc
+        return ipc.new_file(self.path, schema, options=ipc.IpcWriteOptions(compression="zstd"))
+
+
+class XlsxWriter(ChunkWriter):
+    """Excel в режиме write-only: строки сразу уходят в файл, а не в модель листа"""
+
+    def __init__(self, path: str, sheet_name: str = "Вакансии"):
+        super().__init__(path)
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ImportError("Для сохранения в Excel установите openpyxl: pip install openpyxl")
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet_name)
+
+    def _write(self, chunk: pd.DataFrame):
+        if self.rows == 0:
+            self._sheet.append([str(column) for column in chunk.columns])
+        for row in self._excel_values(chunk).itertuples(index=False, name=None):
+            self._sheet.append(row)
+
+    def close(self):
+        self._workbook.save(self.path)
+
+    @staticmethod
+    def _excel_values(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Приводит типы, которые Excel не понимает: списки, даты с часовым поясом, NA"""
+        chunk = chunk.copy()
+        for name in chunk.columns:
+            column = chunk[name]
+            if isinstance(column.dtype, pd.DatetimeTZDtype):
+                chunk[name] = column.dt.tz_localize(None)
+            elif column.dtype == object and column.map(lambda value: isinstance(value, list)).any():
+                chunk[name] = column.map(lambda value: ", ".join(value) if isinstance(value, list) else value)
+        return chunk.astype(object).where(chunk.notna(), None)
+
+
+WRITERS = {
+    "csv": CsvWriter,
+    "jsonl": JsonlWriter,
+    "parquet": ParquetWriter,
+    "feather": FeatherWriter,
+    "xlsx": XlsxWriter,
+}
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Неподдерживаемый формат файла: {extension or path}")
+    return FORMATS[extension]
+
+
+def open_writer(path: str, fmt: Optional[str] = None, sheet_name: Optional[str] = None) -> ChunkWriter:
+    """Открывает писатель для формата, заданного явно или расширением файла
+
+    sheet_name - имя листа для xlsx (по умолчанию "Вакансии"), другие форматы его не используют.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "xlsx" and sheet_name:
+        return XlsxWriter(path, sheet_name=sheet_name)
+    return WRITERS[fmt](path)
+
+
+def export_chunks(chunks: Iterable[pd.DataFrame],
+                  path: str,
+                  fmt: Optional[str] = None,
+                  sheet_name: Optional[str] = None) -> int:
+    """Записывает порции в файл и возвращает число строк"""
+    with open_writer(path, fmt, sheet_name) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.rows
+
+
+def export_frame(df: pd.DataFrame, path: str, fmt: Optional[str] = None, sheet_name: Optional[str] = None) -> int:
+    return export_chunks([df], path, fmt, sheet_name)
@@ -1,17 +1,50 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from hh_parser import HHParser
-from collections import Counter
+from vacancy_cache import VacancyCache
+from vacancy_store import VacancyStore
+from result_cache import SearchResultCache
+from skill_analytics import skill_frequencies
+from summary_stats import SummaryStats
+from salary_analytics import CurrencyRates
+from exporters import export_frame
+from sidecar import compact_vacancy, write_sidecar, read_sidecar
+from dedup import deduplicate_frame
 import pandas as pd
 import re
+import os
+import queue
+import threading
+import time
+
+class TaskCancelled(Exception):
+    """Фоновая задача остановлена кнопкой «Отмена»"""
+
 
 class HHparserApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Парсер вакансий HH.ru")
         self.root.geometry("850x800")
-        self.parser = HHParser()
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        self.parser = HHParser(
+            cache=VacancyCache(os.path.join(app_dir, "vacancy_cache.sqlite3")),
+            store=VacancyStore(os.path.join(app_dir, "vacancies.sqlite3")),
+            # Последние выдачи в памяти: смена фильтров применяется без повторной загрузки
+            result_cache=SearchResultCache()
+        )
+        # Курсы валют для медианы зарплаты в рублях; справочник HH обновляется при поиске раз в сутки
+        self.salary_rates = CurrencyRates(os.path.join(app_dir, "currency_rates.json")).load()
+        # Состояние прерванного поиска: повторный запуск продолжит с последней страницы
+        self.checkpoint_path = os.path.join(app_dir, "search_checkpoint.jsonl")
         self.current_data = None
+        # Сжатые исходные данные вакансий текущей выборки для файла-спутника
+        self.current_raw = []
+        
+        # Фоновые задачи общаются с интерфейсом только через очередь
+        self.task_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.task_handlers = None
         
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True)
@@ -79,8 +112,55 @@ class HHparserApp:
             variable=self.schedule_vars["office"]
         ).pack(anchor=tk.W, pady=2)
         
-        self.search_btn = ttk.Button(main_frame, text="Найти вакансии", command=self.run_search)
-        self.search_btn.pack(pady=15)
+        filters_frame = ttk.Frame(main_frame)
+        filters_frame.pack(pady=5)
+        
+        self.with_salary_filter_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            filters_frame,
+            text="Только с зарплатой",
+            variable=self.with_salary_filter_var
+        ).pack(side=tk.LEFT, padx=10)
+        
+        ttk.Label(filters_frame, text="Опыт:").pack(side=tk.LEFT)
+        self.experience_options = {
+            "Любой": None,
+            "Нет опыта": "noExperience",
+            "От 1 года до 3 лет": "between1And3",
+            "От 3 до 6 лет": "between3And6",
+            "Более 6 лет": "moreThan6"
+        }
+        self.experience_filter_var = tk.StringVar(value="Любой")
+        ttk.Combobox(
+            filters_frame,
+            textvariable=self.experience_filter_var,
+            values=list(self.experience_options),
+            state="readonly",
+            width=20
+        ).pack(side=tk.LEFT, padx=5)
+        
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(pady=5)
+        
+        self.search_btn = ttk.Button(buttons_frame, text="Найти вакансии", command=self.run_search)
+        self.search_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_btn = ttk.Button(buttons_frame, text="Отмена", command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.offline_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            main_frame,
+            text="Искать в сохраненных вакансиях (без загрузки)",
+            variable=self.offline_var
+        ).pack()
+        
+        self.dedup_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            main_frame,
+            text="Убирать повторно опубликованные вакансии",
+            variable=self.dedup_var
+        ).pack()
         
         self.progress = ttk.Progressbar(main_frame, orient="horizontal", length=400, mode="determinate")
         self.progress.pack(pady=5)
@@ -129,6 +209,53 @@ class HHparserApp:
         
         self.skills_status = ttk.Label(skills_frame, text="")
         self.skills_status.pack(pady=10)
+        
+        self.create_metrics_section()
+    
+    def create_metrics_section(self):
+        """Метрики работы парсера: запросы, повторы, фильтр, время обработки"""
+        metrics_frame = ttk.LabelFrame(self.analytics_tab, text="Метрики работы")
+        metrics_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        self.show_metrics_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            metrics_frame,
+            text="Показывать метрики",
+            variable=self.show_metrics_var,
+            command=self.refresh_metrics
+        ).pack(anchor="w", padx=5)
+        
+        self.metrics_var = tk.StringVar(value="")
+        ttk.Label(metrics_frame, textvariable=self.metrics_var, justify=tk.LEFT).pack(anchor="w", padx=5)
+        
+        ttk.Button(
+            metrics_frame,
+            text="Сохранить метрики",
+            command=self.save_metrics
+        ).pack(pady=5)
+    
+    def refresh_metrics(self):
+        """Обновляет сводку раз в секунду, пока включен флажок"""
+        if not self.show_metrics_var.get():
+            self.metrics_var.set("")
+            return
+        self.metrics_var.set(self.parser.metrics.summary())
+        self.root.after(1000, self.refresh_metrics)
+    
+    def save_metrics(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("Prometheus", "*.prom")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            metrics = self.parser.metrics
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(metrics.to_prometheus() if file_path.lower().endswith(".prom") else metrics.to_json())
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить метрики: {str(e)}")
     
     def create_info_panel(self):
         """Создает панель информации с вертикальным расположением статистики"""
@@ -187,9 +314,63 @@ class HHparserApp:
         )
         self.save_results_btn.pack(pady=5)
         
+        self.save_raw_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            save_frame,
+            text="Сохранять исходные данные вакансий (быстрая статистика по файлу)",
+            variable=self.save_raw_var
+        ).pack()
+        
         self.save_status = ttk.Label(save_frame, text="Данные не загружены")
         self.save_status.pack()
     
+    def run_in_background(self, work, on_result, on_error, on_cancel):
+        """Запускает work() в отдельном потоке; обработчики вызываются в потоке Tk"""
+        self.cancel_event.clear()
+        self.task_handlers = {"result": on_result, "error": on_error, "cancelled": on_cancel}
+        self.cancel_btn.config(state=tk.NORMAL)
+        
+        def target():
+            try:
+                self.task_queue.put(("result", work()))
+            except TaskCancelled:
+                self.task_queue.put(("cancelled", None))
+            except Exception as e:
+                self.task_queue.put(("error", e))
+        
+        threading.Thread(target=target, daemon=True).start()
+        self.root.after(100, self.poll_task_queue)
+    
+    def poll_task_queue(self):
+        """Разбирает сообщения фоновой задачи"""
+        try:
+            while True:
+                kind, payload = self.task_queue.get_nowait()
+                if kind == "progress":
+                    self.update_progress(*payload)
+                elif kind == "status":
+                    self.detailed_status_var.set(payload)
+                elif kind == "chunk":
+                    self.add_results_chunk(payload)
+                else:
+                    self.cancel_btn.config(state=tk.DISABLED)
+                    handler = self.task_handlers[kind]
+                    self.task_handlers = None
+                    handler(payload)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_task_queue)
+    
+    def cancel_task(self):
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.status_var.set("Остановка...")
+    
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+    
     def create_stats_from_file(self):
         """Создает статистику навыков из существующего файла"""
         try:
@@ -219,31 +400,54 @@ class HHparserApp:
                 messagebox.showerror("Ошибка", "Не удалось извлечь ID вакансий из ссылок")
                 return
             
-            self.status_var.set("Получение данных по вакансиям из файла...")
-            self.root.update()
-            
-            vacancies_df = self.parser.get_vacancies_by_ids(vacancy_ids)
+            # Вакансии из файла-спутника не нужно загружать повторно
+            known_vacancies = read_sidecar(filepath)
             
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка при создании статистики:\n{str(e)}")
+            self.skills_status.config(text="Ошибка создания статистики")
+            return
+        
+        self.status_var.set("Получение данных по вакансиям из файла...")
+        self.create_stats_btn.config(state=tk.DISABLED)
+        self.search_btn.config(state=tk.DISABLED)
+        self.run_in_background(
+            lambda: self.fetch_file_vacancies(vacancy_ids, known_vacancies),
+            on_result=self.finish_stats_from_file,
+            on_error=self.fail_stats_from_file,
+            on_cancel=lambda _: self.finish_stats_from_file(None)
+        )
+    
+    def fetch_file_vacancies(self, vacancy_ids, known_vacancies=None, batch_size=50):
+        """Загружает вакансии порциями, чтобы можно было остановить задачу (в фоновом потоке)"""
+        frames = []
+        for start in range(0, len(vacancy_ids), batch_size):
+            self.check_cancelled()
+            frames.append(self.parser.get_vacancies_by_ids(
+                vacancy_ids[start:start + batch_size], known_vacancies=known_vacancies
+            ))
+            done = min(start + batch_size, len(vacancy_ids))
+            self.task_queue.put(("status", f"Получено {done} из {len(vacancy_ids)} вакансий"))
+        return pd.concat(frames, ignore_index=True)
+    
+    def finish_stats_from_file(self, vacancies_df):
+        self.create_stats_btn.config(state=tk.NORMAL)
+        self.search_btn.config(state=tk.NORMAL)
+        self.status_var.set("Готов к работе")
+        self.detailed_status_var.set("")
+        if vacancies_df is None:
+            return
+        
+        try:
             if vacancies_df.empty:
                 messagebox.showwarning("Предупреждение", "Не удалось получить данные по вакансиям")
                 return
             
-            all_skills = []
-            for skills_str in vacancies_df["Ключевые навыки"]:
-                if skills_str != "Не указаны":
-                    skills = [s.strip() for s in skills_str.split(",")]
-                    all_skills.extend(skills)
-            
-            if not all_skills:
+            skills_df = skill_frequencies(vacancies_df)
+            if skills_df.empty:
                 messagebox.showinfo("Информация", "В выбранных вакансиях не указаны ключевые навыки")
                 return
             
-            skills_counter = Counter(all_skills)
-            skills_df = pd.DataFrame({
-                "Навык": list(skills_counter.keys()),
-                "Частота": list(skills_counter.values())
-            }).sort_values("Частота", ascending=False)
-            
             save_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
                 filetypes=[("Excel files", "*.xlsx")],
@@ -251,63 +455,156 @@ class HHparserApp:
             )
             
             if save_path:
-                skills_df.to_excel(save_path, index=False)
+                export_frame(skills_df, save_path, sheet_name="Навыки")
                 self.skills_status.config(text=f"Файл с навыками сохранен: {save_path}")
                 messagebox.showinfo("Успешно", "Статистика ключевых навыков создана и сохранена!")
             
         except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка при создании статистики:\n{str(e)}")
-            self.skills_status.config(text="Ошибка создания статистики")
-        finally:
-            self.status_var.set("Готов к работе")
+            self.fail_stats_from_file(e)
+    
+    def fail_stats_from_file(self, error):
+        self.create_stats_btn.config(state=tk.NORMAL)
+        self.search_btn.config(state=tk.NORMAL)
+        self.status_var.set("Готов к работе")
+        messagebox.showerror("Ошибка", f"Ошибка при создании статистики:\n{str(error)}")
+        self.skills_status.config(text="Ошибка создания статистики")
     
     def run_search(self):
         keyword = self.keyword_entry.get().strip()
         if not keyword:
             messagebox.showerror("Ошибка", "Введите ключевое слово!")
             return
-            
-        try:
-            area = self.area_var.get()
-            stop_words = self.stop_words_entry.get().strip()
-            
-            schedules = {
-                "remote": self.schedule_vars["remote"].get(),
-                "hybrid": self.schedule_vars["hybrid"].get(),
-                "office": self.schedule_vars["office"].get()
-            }
-            
-            self.progress["value"] = 0
-            self.progress.pack()
-            self.status_var.set("Идет поиск вакансий...")
-            self.root.update()
-            
-            self.search_btn.config(state=tk.DISABLED)
-            self.save_results_btn.config(state=tk.DISABLED)
-            self.save_btn.config(state=tk.DISABLED)
-            
-            self.current_data = self.parser.get_vacancies(
+        
+        area = self.area_var.get()
+        stop_words = self.stop_words_entry.get().strip()
+        
+        schedules = {
+            "remote": self.schedule_vars["remote"].get(),
+            "hybrid": self.schedule_vars["hybrid"].get(),
+            "office": self.schedule_vars["office"].get()
+        }
+        with_salary = self.with_salary_filter_var.get()
+        experience_id = self.experience_options.get(self.experience_filter_var.get())
+        experience = [experience_id] if experience_id else None
+        
+        self.progress["value"] = 0
+        self.progress.pack()
+        self.status_var.set("Идет поиск вакансий...")
+        
+        self.search_btn.config(state=tk.DISABLED)
+        self.create_stats_btn.config(state=tk.DISABLED)
+        self.save_results_btn.config(state=tk.DISABLED)
+        self.save_btn.config(state=tk.DISABLED)
+        
+        self.current_data = None
+        self.current_raw = []
+        self.result_chunks = []
+        self.live_stats = SummaryStats(self.salary_rates)
+        raw_vacancies = self.current_raw
+        
+        def raw_callback(items):
+            fetched_at = time.time()
+            for item in items:
+                record = compact_vacancy(item)
+                record["_fetched_at"] = fetched_at
+                raw_vacancies.append(record)
+        
+        def progress_callback(current, total):
+            # Вызывается в фоновом потоке перед каждой страницей
+            self.check_cancelled()
+            self.task_queue.put(("progress", (current, total)))
+        
+        def offline_work():
+            self.task_queue.put(("chunk", self.parser.search_offline(
+                keyword=keyword,
+                area=area,
+                stop_words=stop_words,
+                schedules=schedules if any(schedules.values()) else None,
+                raw_callback=raw_callback,
+                with_salary=with_salary,
+                experience=experience
+            )))
+        
+        def work():
+            self.salary_rates.load(self.parser.client)
+            # Если тот же запрос уже загружался, достаточно применить новые фильтры
+            refiltered = self.parser.refilter(
                 keyword=keyword,
                 area=area,
                 stop_words=stop_words,
                 schedules=schedules if any(schedules.values()) else None,
-                progress_callback=self.update_progress
+                with_salary=with_salary,
+                experience=experience,
+                raw_callback=raw_callback
             )
+            if refiltered is not None:
+                self.task_queue.put(("chunk", refiltered))
+                return True
             
-            self.update_info_panel(self.current_data)
+            chunks = self.parser.iter_vacancies(
+                keyword=keyword,
+                area=area,
+                stop_words=stop_words,
+                schedules=schedules if any(schedules.values()) else None,
+                progress_callback=progress_callback,
+                as_frames=True,
+                checkpoint_path=self.checkpoint_path,
+                raw_callback=raw_callback,
+                with_salary=with_salary,
+                experience=experience
+            )
+            for chunk in chunks:
+                self.task_queue.put(("chunk", chunk))
+                self.check_cancelled()
+        
+        self.run_in_background(
+            offline_work if self.offline_var.get() else work,
+            on_result=lambda refiltered: self.finish_search(
+                "Фильтры применены без повторной загрузки" if refiltered else "Поиск завершен!"
+            ),
+            on_error=self.fail_search,
+            on_cancel=lambda _: self.finish_search("Поиск остановлен")
+        )
+    
+    def add_results_chunk(self, chunk):
+        """Показывает очередную страницу результатов, не дожидаясь конца поиска"""
+        self.result_chunks.append(chunk)
+        self.live_stats.update(chunk)
+        if self.live_stats.total:
+            self.render_summary(self.live_stats)
+    
+    def finish_search(self, status):
+        if self.result_chunks:
+            self.current_data = pd.concat(self.result_chunks, ignore_index=True)
+        else:
+            self.current_data = pd.DataFrame()
+        self.result_chunks = []
+        
+        if self.dedup_var.get() and not self.current_data.empty:
+            found = len(self.current_data)
+            self.current_data = deduplicate_frame(self.current_data)
+            if len(self.current_data) < found:
+                self.live_stats = SummaryStats.from_frame(self.current_data, self.salary_rates)
+        
+        self.render_summary(self.live_stats)
+        if not self.current_data.empty:
             self.save_results_btn.config(state=tk.NORMAL)
             self.save_btn.config(state=tk.NORMAL)
-            self.status_var.set("Поиск завершен!")
-            self.detailed_status_var.set(f"Найдено {len(self.current_data)} вакансий")
-            
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Произошла ошибка:\n{str(e)}")
-            self.status_var.set("Ошибка при выполнении")
-            self.detailed_status_var.set("")
-            self.reset_ui()
-        finally:
-            self.search_btn.config(state=tk.NORMAL)
-            self.root.after(3000, lambda: self.progress.pack_forget())
+        self.status_var.set(status)
+        self.detailed_status_var.set(f"Найдено {len(self.current_data)} вакансий")
+        self.search_btn.config(state=tk.NORMAL)
+        self.create_stats_btn.config(state=tk.NORMAL)
+        self.root.after(3000, lambda: self.progress.pack_forget())
+    
+    def fail_search(self, error):
+        self.result_chunks = []
+        messagebox.showerror("Ошибка", f"Произошла ошибка:\n{str(error)}")
+        self.status_var.set("Ошибка при выполнении")
+        self.detailed_status_var.set("")
+        self.reset_ui()
+        self.search_btn.config(state=tk.NORMAL)
+        self.create_stats_btn.config(state=tk.NORMAL)
+        self.root.after(3000, lambda: self.progress.pack_forget())
     
     def save_skills(self):
         if self.current_data is None or self.current_data.empty:
@@ -315,25 +612,11 @@ class HHparserApp:
             return
             
         try:
-            all_skills = []
-            for skills_str in self.current_data["Ключевые навыки"]:
-                if skills_str != "Не указаны":
-                    skills = [s.strip() for s in skills_str.split(",")]
-                    all_skills.extend(skills)
-            
-            if not all_skills:
+            skills_df = skill_frequencies(self.current_data)
+            if skills_df.empty:
                 messagebox.showinfo("Информация", "В выбранных вакансиях не указаны ключевые навыки")
                 return
             
-            skills_counter = Counter(all_skills)
-            
-            skills_df = pd.DataFrame({
-                "Навык": list(skills_counter.keys()),
-                "Частота": list(skills_counter.values())
-            })
-            
-            skills_df = skills_df.sort_values("Частота", ascending=False)
-            
             filepath = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
                 filetypes=[("Excel files", "*.xlsx")],
@@ -341,7 +624,7 @@ class HHparserApp:
             )
             
             if filepath:
-                skills_df.to_excel(filepath, index=False)
+                export_frame(skills_df, filepath, sheet_name="Навыки")
                 self.skills_status.config(text=f"Файл с навыками сохранен: {filepath}")
                 messagebox.showinfo("Успешно", "Статистика ключевых навыков сохранена!")
                 
@@ -354,7 +637,6 @@ class HHparserApp:
         self.progress["value"] = progress
         self.detailed_status_var.set(f"Обработка страницы {current} из {total}")
         self.pages_var.set(f"Страниц: {current}/{total}")
-        self.root.update_idletasks()
     
     def save_results(self):
         if self.current_data is None or self.current_data.empty:
@@ -368,18 +650,21 @@ class HHparserApp:
                 filetypes=[
                     ("Excel files", "*.xlsx"), 
                     ("CSV files", "*.csv"),
-                    ("JSON files", "*.json")
+                    ("JSON files", "*.json"),
+                    ("JSON Lines files", "*.jsonl"),
+                    ("Parquet files", "*.parquet"),
+                    ("Feather files", "*.feather")
                 ],
                 initialfile=f"вакансии_{keyword}"
             )
             
             if filepath:
-                if filepath.endswith('.csv'):
-                    self.current_data.to_csv(filepath, index=False)
-                elif filepath.endswith('.json'):
+                if filepath.endswith('.json'):
                     self.current_data.to_json(filepath, orient='records', force_ascii=False)
                 else:
-                    self.current_data.to_excel(filepath, index=False)
+                    export_frame(self.current_data, filepath)
+                if self.save_raw_var.get() and self.current_raw:
+                    write_sidecar(filepath, self.current_raw)
                 
                 self.save_status.config(text=f"Файл сохранен: {filepath}")
                 messagebox.showinfo("Успешно", "Данные сохранены!")
@@ -389,45 +674,42 @@ class HHparserApp:
             self.save_status.config(text="Ошибка сохранения")
     
     def update_info_panel(self, df):
-        total = len(df)
+        self.render_summary(SummaryStats.from_frame(df, self.salary_rates))
+    
+    def render_summary(self, stats):
+        """Отображает заранее посчитанную статистику SummaryStats"""
+        total = stats.total
         if total == 0:
             self.reset_ui()
             return
         
         # Основная статистика
-        with_salary = len(df[df['Зарплата'] != "Не указана"])
-        last_date = df['Дата публикации'].max()
-        
         self.total_var.set(f"Всего вакансий: {total}")
-        self.with_salary_var.set(f"С зарплатой: {with_salary} ({with_salary/total*100:.1f}%)")
-        self.last_date_var.set(f"Последняя дата: {last_date}")
+        median_salary = stats.median_salary()
+        self.with_salary_var.set(
+            f"С зарплатой: {stats.with_salary} ({stats.percent(stats.with_salary)}%)"
+            + (f", медиана ≈ {median_salary:,.0f} ₽".replace(",", " ") if median_salary is not None else "")
+        )
+        self.last_date_var.set(f"Последняя дата: {stats.last_date}")
+        
+        experience_col = self.info_frame.winfo_children()[0].winfo_children()[1]
+        schedule_col = self.info_frame.winfo_children()[0].winfo_children()[2]
         
         # Очищаем предыдущую статистику
-        for col in [self.info_frame.winfo_children()[0].winfo_children()[1],  # Колонка опыта
-                    self.info_frame.winfo_children()[0].winfo_children()[2]]: # Колонка графика
+        for col in [experience_col, schedule_col]:
             for widget in col.winfo_children()[1:]:
                 widget.destroy()
         
         # Статистика по опыту работы
-        experience_stats = df['Опыт работы'].value_counts(normalize=True).mul(100).round(1)
-        for exp, percent in experience_stats.items():
-            count = len(df[df['Опыт работы'] == exp])
-            label_text = f"{exp}: {count} ({percent}%)"
-            ttk.Label(self.info_frame.winfo_children()[0].winfo_children()[1], 
-                     text=label_text, anchor="w").pack(fill=tk.X)
+        for exp, count, percent in stats.experience_items():
+            ttk.Label(experience_col, text=f"{exp}: {count} ({percent}%)", anchor="w").pack(fill=tk.X)
         
         # Статистика по графику работы
-        schedule_stats = df['График работы'].value_counts(normalize=True).mul(100).round(1)
-        for schedule, percent in schedule_stats.items():
-            count = len(df[df['График работы'] == schedule])
-            label_text = f"{schedule}: {count} ({percent}%)"
-            ttk.Label(self.info_frame.winfo_children()[0].winfo_children()[2], 
-                     text=label_text, anchor="w").pack(fill=tk.X)
+        for schedule, count, percent in stats.schedule_items():
+            ttk.Label(schedule_col, text=f"{schedule}: {count} ({percent}%)", anchor="w").pack(fill=tk.X)
         
         # Статистика по контактам
-        with_contacts = len(df[df['Контакты'] != "Не указаны"])
-        percent = with_contacts / total * 100
-        self.contacts_var.set(f"Указаны: {with_contacts} ({percent:.1f}%)")
+        self.contacts_var.set(f"Указаны: {stats.with_contacts} ({stats.with_contacts / total * 100:.1f}%)")
     
     def reset_ui(self):
         self.total_var.set("Всего вакансий: -")
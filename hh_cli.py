@@ -0,0 +1,270 @@
+"""Пакетный запуск парсера из командной строки (без tkinter)
+
+Файл заданий - JSON-массив объектов, например:
+
+    [
+        {"name": "python_msk", "keyword": "python", "area": 1,
+         "stop_words": "senior, lead", "schedules": ["remote", "hybrid"]},
+        {"keyword": "django", "area": 2, "mode": "incremental", "format": "jsonl"}
+    ]
+
+Поля задания: keyword (обязательно), name, area, stop_words, schedules
+(remote/hybrid/office), morphology, detail_fields, with_salary и experience
+(только для full и offline), dedup (порог сходства
+для удаления почти одинаковых вакансий, задание собирается в памяти целиком),
+format (csv/jsonl/xlsx/parquet/feather),
+mode (full/incremental/partitioned/offline). Результат каждого задания пишется
+в отдельный файл <output-dir>/<name>.<format>; с --sidecar для режима full
+рядом пишется файл-спутник с исходными данными вакансий (см. sidecar.py).
+С --store все найденные вакансии дописываются в локальное хранилище
+(см. vacancy_store.py); режим offline ищет только в нем, без запросов к API.
+С --descriptions полные описания разбираются в пуле процессов: навыки по
+словарю (--skills, см. description_processing.py) и ключевое слово по полному тексту.
+С --metrics после всех заданий сохраняются метрики запуска (см. metrics.py):
+в формате Prometheus для файлов .prom/.txt, иначе в JSON.
+С --salaries после всех заданий пишется таблица медиан и перцентилей зарплат
+в рублях по опыту, графику, региону и навыкам (см. salary_analytics.py); курсы
+валют кэшируются в файле --rates.
+С --batch все задания режима full выполняются одним пакетом (см. batch_search.py):
+общий пул и лимит запросов, детали общих вакансий загружаются один раз; кроме
+файлов заданий пишется <output-dir>/merged.<format> со столбцом "Запросы".
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from typing import Iterable, List, Optional, Tuple
+
+
+# Форматы, которые пишутся из записей без pandas
+RECORD_FORMATS = ("csv", "jsonl")
+
+
+def _write_records(records: Iterable[dict], path: str, fmt: str) -> int:
+    """Пишет записи в csv или jsonl без pandas и без накопления в памяти"""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = None
+        for record in records:
+            if fmt == "jsonl":
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(record.keys()))
+                    writer.writeheader()
+                writer.writerow(record)
+            count += 1
+    return count
+
+
+def _write_metrics(metrics, path: str):
+    prometheus = os.path.splitext(path)[1].lower() in (".prom", ".txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(metrics.to_prometheus() if prometheus else metrics.to_json())
+
+
+def _job_name(job: dict, index: int) -> str:
+    name = job.get("name") or f"{index:03d}_{job.get('keyword', '')}_{job.get('area', 1)}"
+    return re.sub(r'[^\w.-]+', '_', name)
+
+
+def _write_frame(df, path: str, fmt: str) -> int:
+    if fmt not in RECORD_FORMATS:
+        from exporters import export_chunks
+        return export_chunks([df], path, fmt)
+    return _write_records(df.to_dict("records"), path, fmt)
+
+
+def run_batch(parser, jobs: List[dict], args) -> Tuple[int, int]:
+    """Задания режима full одним пакетом; возвращает (вакансий в сводном файле, неудавшихся заданий)"""
+    from batch_search import SearchQuery, query_names
+    from dedup import deduplicate_frame
+
+    queries = [
+        SearchQuery(
+            keyword=job["keyword"],
+            area=job.get("area", 1),
+            stop_words=job.get("stop_words"),
+            schedules={key: True for key in job.get("schedules", [])} or None,
+            morphology=job.get("morphology", False),
+            with_salary=job.get("with_salary", False),
+            experience=job.get("experience"),
+            name=_job_name(job, index)
+        )
+        for index, job in jobs
+    ]
+    # detail_fields в пакете общие: берутся из первого задания, где они заданы
+    detail_fields = next((job["detail_fields"] for _, job in jobs if "detail_fields" in job), None)
+    result = parser.get_vacancies_batch(queries, detail_fields=detail_fields)
+
+    for (index, job), name in zip(jobs, query_names(queries)):
+        if name in result.failed:
+            print(f"[{index}] {name}: ошибка: {result.failed[name]}", file=sys.stderr)
+            continue
+        df = result.per_query[name]
+        fmt = job.get("format", args.format)
+        if job.get("dedup"):
+            df = deduplicate_frame(df, threshold=job["dedup"])
+        count = _write_frame(df, os.path.join(args.output_dir, f"{name}.{fmt}"), fmt)
+        print(f"[{index}] {name}: {count} вакансий", file=sys.stderr)
+    stats = result.stats
+    print(f"Пакет: {stats['queries']} запросов, {stats['pages']} страниц, {stats['details']} деталей, "
+          f"повторов без загрузки: {stats['shared']}, неудавшихся запросов: {stats['failed']}", file=sys.stderr)
+    count = _write_frame(result.merged, os.path.join(args.output_dir, f"merged.{args.format}"), args.format)
+    return count, len(result.failed)
+
+
+def run_job(parser, job: dict, index: int, args) -> int:
+    from delta_store import DeltaStore
+    from sidecar import SidecarWriter, sidecar_path
+
+    if not job.get("keyword"):
+        raise ValueError("В задании не указано ключевое слово")
+    name = _job_name(job, index)
+    fmt = job.get("format", args.format)
+    mode = job.get("mode", "full")
+    dedup = job.get("dedup")
+    output_path = os.path.join(args.output_dir, f"{name}.{fmt}")
+    schedules = {key: True for key in job.get("schedules", [])} or None
+    common = dict(
+        keyword=job["keyword"],
+        area=job.get("area", 1),
+        stop_words=job.get("stop_words"),
+        schedules=schedules,
+        morphology=job.get("morphology", False)
+    )
+
+    sidecar = None
+    if mode == "full":
+        checkpoint_path = None
+        if args.checkpoint_dir:
+            checkpoint_path = os.path.join(args.checkpoint_dir, f"{name}.checkpoint.jsonl")
+        if args.sidecar:
+            sidecar = SidecarWriter(sidecar_path(output_path))
+        results = parser.iter_vacancies(
+            detail_fields=job.get("detail_fields"), checkpoint_path=checkpoint_path,
+            as_frames=fmt not in RECORD_FORMATS and not dedup,
+            raw_callback=sidecar.write if sidecar else None,
+            with_salary=job.get("with_salary", False), experience=job.get("experience"), **common
+        )
+    elif mode == "incremental":
+        results = [parser.get_vacancies_incremental(store=DeltaStore(args.state_dir), **common)]
+    elif mode == "partitioned":
+        results = [parser.get_vacancies_partitioned(detail_fields=job.get("detail_fields"), **common)]
+    elif mode == "offline":
+        common["area"] = job.get("area")
+        results = [parser.search_offline(
+            with_salary=job.get("with_salary", False), experience=job.get("experience"), **common
+        )]
+    else:
+        raise ValueError(f"Неизвестный режим задания: {mode}")
+
+    try:
+        if dedup:
+            from dedup import deduplicate_frame
+            from hh_parser import _records_to_frame
+            frame = _records_to_frame(list(results)) if mode == "full" else results[0]
+            results, mode = [deduplicate_frame(frame, threshold=dedup)], "dedup"
+        if fmt not in RECORD_FORMATS:
+            from exporters import export_chunks
+            return export_chunks(results, output_path, fmt)
+        if mode != "full":
+            results = results[0].to_dict("records")
+        return _write_records(results, output_path, fmt)
+    finally:
+        if sidecar:
+            sidecar.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Пакетный поиск вакансий HH.ru")
+    arg_parser.add_argument("jobs", help="JSON-файл со списком заданий")
+    arg_parser.add_argument("-o", "--output-dir", default="output", help="каталог для результатов")
+    arg_parser.add_argument("-f", "--format", default="csv", choices=["csv", "jsonl", "xlsx", "parquet", "feather"],
+                            help="формат по умолчанию")
+    arg_parser.add_argument("--cache", help="файл SQLite-кэша деталей вакансий")
+    arg_parser.add_argument("--store", help="файл SQLite локального хранилища вакансий")
+    arg_parser.add_argument("--checkpoint-dir", help="каталог для состояния прерванных поисков")
+    arg_parser.add_argument("--state-dir", default="delta_state", help="каталог для инкрементальных запросов")
+    arg_parser.add_argument("--sidecar", action="store_true",
+                            help="сохранять рядом с результатом исходные данные вакансий")
+    arg_parser.add_argument("--workers", type=int, default=4, help="одновременных запросов деталей")
+    arg_parser.add_argument("--rate", type=float, default=5.0, help="запросов в секунду")
+    arg_parser.add_argument("--descriptions", action="store_true",
+                            help="разбирать полные описания: навыки и ключевое слово по всему тексту")
+    arg_parser.add_argument("--skills", help="JSON-словарь навыков для --descriptions")
+    arg_parser.add_argument("--batch", action="store_true",
+                            help="выполнять задания режима full одним пакетом с общим пулом запросов")
+    arg_parser.add_argument("--salaries", help="файл (.csv/.xlsx) для статистики зарплат по найденным вакансиям")
+    arg_parser.add_argument("--rates", default="currency_rates.json", help="файл кэша курсов валют")
+    arg_parser.add_argument("--metrics", help="файл для метрик запуска (.prom/.txt - Prometheus, иначе JSON)")
+    args = arg_parser.parse_args(argv)
+
+    with open(args.jobs, encoding="utf-8") as f:
+        jobs = json.load(f)
+
+    from hh_parser import HHParser
+    from vacancy_cache import VacancyCache
+    from vacancy_store import VacancyStore
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+    cache = VacancyCache(args.cache) if args.cache else None
+    store = VacancyStore(args.store) if args.store else None
+    processor = None
+    if args.descriptions:
+        from description_processing import DescriptionProcessor, load_skill_dictionary
+        processor = DescriptionProcessor(skills=load_skill_dictionary(args.skills) if args.skills else None)
+    parser = HHParser(max_workers=args.workers, cache=cache, rate_limit=args.rate, store=store,
+                      description_processor=processor)
+    if args.salaries:
+        from salary_analytics import CurrencyRates, SalaryAnalytics
+        parser.salary_analytics = SalaryAnalytics(CurrencyRates(args.rates).load(parser.client))
+
+    failed = 0
+    numbered = list(enumerate(jobs, 1))
+    if args.batch:
+        # Задания без ключевого слова остаются в общем цикле и завершаются ошибкой там
+        batch_jobs = [(index, job) for index, job in numbered
+                      if job.get("mode", "full") == "full" and job.get("keyword")]
+        numbered = [(index, job) for index, job in numbered if (index, job) not in batch_jobs]
+        if batch_jobs:
+            started = time.monotonic()
+            try:
+                count, batch_failed = run_batch(parser, batch_jobs, args)
+                failed += batch_failed
+                print(f"Пакет из {len(batch_jobs)} заданий: {count} вакансий "
+                      f"за {time.monotonic() - started:.1f} с", file=sys.stderr)
+            except Exception as e:
+                failed += 1
+                print(f"Пакет из {len(batch_jobs)} заданий: ошибка: {str(e)}", file=sys.stderr)
+
+    for index, job in numbered:
+        started = time.monotonic()
+        try:
+            count = run_job(parser, job, index, args)
+            print(f"[{index}/{len(jobs)}] {_job_name(job, index)}: {count} вакансий "
+                  f"за {time.monotonic() - started:.1f} с", file=sys.stderr)
+        except Exception as e:
+            failed += 1
+            print(f"[{index}/{len(jobs)}] {_job_name(job, index)}: ошибка: {str(e)}", file=sys.stderr)
+
+    if processor:
+        processor.close()
+    if args.salaries:
+        report = parser.salary_analytics.report()
+        if args.salaries.lower().endswith(".xlsx"):
+            report.to_excel(args.salaries, index=False)
+        else:
+            report.to_csv(args.salaries, index=False)
+    if args.metrics:
+        _write_metrics(parser.metrics, args.metrics)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
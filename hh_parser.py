@@ -1,13 +1,70 @@
+from __future__ import annotations
+
 import requests
-import pandas as pd
-import time
 import re
-from typing import Optional, Callable, List, Union, Dict
+import time
+from typing import TYPE_CHECKING, Optional, Callable, List, Union, Dict, Iterator
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from vacancy_cache import VacancyCache
+from http_client import HHClient
+from text_matcher import VacancyMatcher
+from checkpoint import CrawlCheckpoint
+from delta_store import DeltaStore
+from metrics import Metrics
+from vacancy_store import VacancyStore
+from vacancy_record import VacancyRecord, RawSpillBuffer
+from sidecar import compact_vacancy
+from result_cache import CachedSearch, SearchResultCache
+from batch_search import BatchSearch, BatchResult, SearchQuery
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from salary_analytics import SalaryAnalytics
+
+
+def _records_to_frame(records: List[dict]) -> pd.DataFrame:
+    # pandas импортируется только тогда, когда действительно нужен DataFrame
+    import pandas as pd
+    return pd.DataFrame(records)
+
 
 class HHParser:
-    def __init__(self):
+    # API отдает не больше 2000 вакансий на запрос (page * per_page)
+    MAX_SEARCH_DEPTH = 2000
+    # Окно дат, которое уже не делится дальше
+    MIN_PARTITION = timedelta(minutes=10)
+    
+    def __init__(self,
+                 max_workers: int = 4,
+                 cache: Optional[VacancyCache] = None,
+                 rate_limit: float = 5.0,
+                 metrics=None,
+                 store: Optional[VacancyStore] = None,
+                 raw_buffer: Optional[RawSpillBuffer] = None,
+                 description_processor=None,
+                 result_cache: Optional[SearchResultCache] = None,
+                 salary_analytics: Optional[SalaryAnalytics] = None):
         self.base_url = "https://api.hh.ru/vacancies"
+        # Число одновременных запросов деталей вакансий (не больше лимитов HH)
+        self.max_workers = max(1, max_workers)
+        # Счетчики и гистограммы этапов (см. metrics); можно передать свою реализацию
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Общий клиент: keep-alive, лимит запросов в секунду и повторы при сбоях
+        self.client = HHClient(pool_size=self.max_workers, rate=rate_limit, metrics=self.metrics)
+        # Кэш деталей вакансий на диске (None - без кэша)
+        self.cache = cache
+        # Локальное хранилище, куда дописываются результаты всех обходов (None - не сохранять)
+        self.store = store
+        # Полные исходные данные вакансий (с описанием) на диске; в памяти - только VacancyRecord
+        self.raw_buffer = raw_buffer
+        # Разбор полных описаний в пуле процессов (description_processing.DescriptionProcessor)
+        self.description_processor = description_processor
+        # Выдача последних поисков до фильтров для refilter (None - не хранить)
+        self.result_cache = result_cache
+        # Потоковая статистика зарплат по найденным вакансиям (None - не считать)
+        self.salary_analytics = salary_analytics
         self.schedule_mapping = {
             "remote": "remote",
             "hybrid": "flexible",
@@ -19,105 +76,658 @@ class HHParser:
                     area: int = 1,
                     stop_words: Optional[Union[str, List[str]]] = None,
                     schedules: Optional[Dict[str, bool]] = None,
-                    progress_callback: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
-        """Поиск вакансий с фильтрацией по формату работы"""
-        vacancies = []
-        keyword_lower = keyword.lower()
-        total_pages = None
+                    progress_callback: Optional[Callable[[int, int], None]] = None,
+                    detail_fields: Optional[List[str]] = None,
+                    morphology: bool = False,
+                    checkpoint_path: Optional[str] = None,
+                    date_from: Optional[str] = None,
+                    typed: bool = False,
+                    dedup: Optional[float] = None,
+                    with_salary: bool = False,
+                    experience: Optional[List[str]] = None) -> pd.DataFrame:
+        """Поиск вакансий с фильтрацией по формату работы
+        
+        detail_fields: None - добавлять все детали вакансии, список полей - только
+        эти поля из деталей, пустой список - не запрашивать детали вовсе.
+        morphology: сравнивать русские слова с учетом окончаний.
+        checkpoint_path: файл состояния, чтобы после сбоя продолжить с последней страницы
+        (не поддерживается вместе с typed).
+        date_from: искать только вакансии, опубликованные не раньше этой даты (ISO 8601).
+        typed: вернуть типизированный DataFrame (см. result_schema) вместо строковых столбцов.
+        dedup: порог сходства (0-1), при котором вакансии одного работодателя считаются
+        копиями; из копий остается самая свежая (см. dedup.py).
+        with_salary, experience: только вакансии с зарплатой / с этими id опыта
+        (noExperience, between1And3, between3And6, moreThan6); проверяются локально,
+        поэтому выдачу потом можно перефильтровать через refilter.
+        """
+        if typed:
+            from result_schema import concat_typed
+            df = concat_typed(list(self.iter_vacancies(
+                keyword, area, stop_words, schedules, progress_callback, detail_fields, morphology,
+                as_frames=True, checkpoint_path=checkpoint_path, date_from=date_from, typed=True,
+                with_salary=with_salary, experience=experience
+            )))
+        else:
+            df = _records_to_frame(list(self.iter_vacancies(
+                keyword, area, stop_words, schedules, progress_callback, detail_fields, morphology,
+                checkpoint_path=checkpoint_path, date_from=date_from, with_salary=with_salary, experience=experience
+            )))
+        
+        if dedup:
+            from dedup import deduplicate_frame
+            df = deduplicate_frame(df, threshold=dedup)
+        return df
+    
+    def iter_vacancies(self,
+                       keyword: str,
+                       area: int = 1,
+                       stop_words: Optional[Union[str, List[str]]] = None,
+                       schedules: Optional[Dict[str, bool]] = None,
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       detail_fields: Optional[List[str]] = None,
+                       morphology: bool = False,
+                       as_frames: bool = False,
+                       checkpoint_path: Optional[str] = None,
+                       date_from: Optional[str] = None,
+                       typed: bool = False,
+                       raw_callback: Optional[Callable[[List[dict]], None]] = None,
+                       with_salary: bool = False,
+                       experience: Optional[List[str]] = None) -> Iterator[Union[dict, pd.DataFrame]]:
+        """Выдает вакансии по мере обработки страниц: записи по одной или DataFrame на страницу
+        
+        raw_callback получает компактные записи (VacancyRecord) каждой загруженной
+        страницы (например, для sidecar.SidecarWriter). С checkpoint_path они
+        сохраняются в состоянии поиска и при продолжении передаются raw_callback снова.
+        """
+        if typed and checkpoint_path:
+            raise ValueError("Типизированный режим не поддерживает checkpoint_path")
         
         stop_words_list = self._process_stop_words(stop_words)
+        checkpoint = None
+        start_page = 0
+        if checkpoint_path:
+            checkpoint = CrawlCheckpoint(checkpoint_path, {
+                "keyword": keyword,
+                "area": str(area),
+                "stop_words": stop_words_list,
+                "schedules": self._selected_schedules(schedules),
+                "detail_fields": detail_fields,
+                "morphology": morphology,
+                "date_from": date_from,
+                "with_salary": with_salary,
+                "experience": experience,
+                # Состояние без исходных данных не подходит для продолжения с raw_callback
+                "raw": raw_callback is not None
+            })
+            if checkpoint.load():
+                # Сначала отдаем результаты уже обработанных страниц
+                start_page = checkpoint.next_page
+                if raw_callback and checkpoint.raw:
+                    raw_callback(checkpoint.raw)
+                if checkpoint.records:
+                    yield from ([_records_to_frame(checkpoint.records)] if as_frames else checkpoint.records)
+                checkpoint.records, checkpoint.raw = [], []
+                if checkpoint.total_pages is not None and start_page >= checkpoint.total_pages:
+                    checkpoint.clear()
+                    return
+            else:
+                checkpoint.start()
+        
+        pages = self._iter_pages(
+            keyword, area, stop_words_list, schedules, progress_callback, detail_fields, morphology,
+            start_page, date_from, with_salary=with_salary, experience=experience
+        )
+        for page, total_pages, items in pages:
+            if checkpoint:
+                # Вакансии могут сдвигаться между страницами, пока идет поиск
+                items = [item for item in items if str(item.get("id")) not in checkpoint.processed_ids]
+            if raw_callback:
+                raw_callback(items)
+            if typed:
+                frame = self._format_results(items, typed=True)
+                if as_frames:
+                    yield frame
+                else:
+                    yield from frame.to_dict("records")
+                continue
+            with self.metrics.timer("format_seconds", typed=False):
+                records = [self._format_vacancy(item) for item in items]
+            if checkpoint:
+                raw = None
+                if raw_callback:
+                    fetched_at = time.time()
+                    raw = [{**compact_vacancy(item), "_fetched_at": fetched_at} for item in items]
+                checkpoint.save_page(page, total_pages, [str(item.get("id")) for item in items], records, raw)
+            if as_frames:
+                if records:
+                    yield _records_to_frame(records)
+            else:
+                yield from records
+        
+        if checkpoint:
+            checkpoint.clear()
+    
+    def _iter_pages(self,
+                    keyword: str,
+                    area: int,
+                    stop_words: Optional[Union[str, List[str]]],
+                    schedules: Optional[Dict[str, bool]],
+                    progress_callback: Optional[Callable[[int, int], None]],
+                    detail_fields: Optional[List[str]],
+                    morphology: bool,
+                    start_page: int = 0,
+                    date_from: Optional[str] = None,
+                    date_to: Optional[str] = None,
+                    with_salary: bool = False,
+                    experience: Optional[List[str]] = None) -> Iterator[tuple]:
+        """Выдает (номер страницы, всего страниц, вакансии) для каждой страницы поиска
+        
+        Полностью пройденная с первой страницы выдача сохраняется в result_cache.
+        """
+        total_pages = None
+        
+        matcher = VacancyMatcher(keyword, self._process_stop_words(stop_words), morphology=morphology)
+        selected_schedules = self._selected_schedules(schedules)
+        # Без загрузки деталей описаний нет, и ключевое слово проверяется по сниппету
+        processor = self.description_processor
+        full_text = bool(processor and processor.full_text and (detail_fields is None or detail_fields))
         
-        selected_schedules = []
-        if schedules:
-            selected_schedules = [self.schedule_mapping[key] for key, value in schedules.items() if value]
+        cached = None
+        if self.result_cache is not None and start_page == 0 and date_to is None:
+            cached = CachedSearch(
+                SearchResultCache.make_key(keyword, area, date_from, date_to, detail_fields), selected_schedules
+            )
         
-        page = 0
+        page = start_page
         while True:
             page += 1
             if progress_callback and total_pages:
                 progress_callback(page, total_pages)
             
-            params = {
-                "text": keyword,
-                "page": page - 1,
-                "per_page": 100,
-                "area": area,
-                "enable_snippets": "true"
-            }
+            data = self._fetch_page(keyword, area, page - 1, selected_schedules, date_from, date_to)
+            
+            if total_pages is None:
+                total_pages = data.get("pages", 1)
+                if progress_callback:
+                    progress_callback(0, total_pages)
             
-            if selected_schedules:
-                params["schedule"] = selected_schedules
+            # Сначала фильтруем по сниппетам, детали запрашиваем только для прошедших фильтр
+            page_items = data.get("items", [])
+            with self.metrics.timer("filter_seconds"):
+                filtered_items = [item for item in page_items if self._matches_fields(item, with_salary, experience)]
+                if full_text:
+                    # Ключевое слово проверяется позже, по полному описанию
+                    filtered_items = [
+                        item for item in filtered_items if not matcher.stop_word_found(self._filter_text(item))
+                    ]
+                else:
+                    filtered_items = [item for item in filtered_items if self._matches_filters(item, matcher)]
+            self.metrics.inc("filter_items_total", len(page_items))
+            with self.metrics.timer("details_stage_seconds"):
+                enriched_items = self._enrich_items(filtered_items, detail_fields, matcher)
+            if cached is not None:
+                cached.items.extend(VacancyRecord.from_payload(item) for item in page_items)
+                cached.details.update((record.id, record) for record in enriched_items)
+            if full_text:
+                # Без загруженного описания остается проверка по сниппету
+                enriched_items = [
+                    item for item in enriched_items
+                    if item.get("description_match") or
+                    ("description_match" not in item and self._matches_filters(item, matcher))
+                ]
+            self.metrics.inc("filter_matched_total", len(enriched_items))
+            self._save_records(enriched_items)
+            yield page - 1, total_pages, enriched_items
             
-            try:
-                response = requests.get(self.base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                if total_pages is None:
-                    total_pages = data.get("pages", 1)
-                    if progress_callback:
-                        progress_callback(0, total_pages)
-                
-                filtered_items = []
-                for item in data.get("items", []):
-                    # Получаем полную информацию о вакансии
-                    vacancy_id = item.get("id")
-                    vacancy_details = self._get_vacancy_details(vacancy_id)
-                    
-                    title = (item.get("name") or "").lower()
-                    snippet = item.get("snippet", {})
-                    requirement = (snippet.get("requirement") or "").lower()
-                    responsibility = (snippet.get("responsibility") or "").lower()
-                    full_text = f"{title} {requirement} {responsibility}"
-                    
-                    keyword_match = full_text.strip() and re.search(rf'\b{re.escape(keyword_lower)}\b', full_text)
-                    
-                    stop_word_found = False
-                    if stop_words_list:
-                        for stop_word in stop_words_list:
-                            if re.search(rf'\b{re.escape(stop_word)}\b', full_text):
-                                stop_word_found = True
-                                break
-                    
-                    if keyword_match and not stop_word_found:
-                        # Добавляем полные данные о вакансии
-                        item.update(vacancy_details)
-                        filtered_items.append(item)
-                
-                vacancies.extend(filtered_items)
-                
-                if page >= total_pages:
-                    break
-                    
-                time.sleep(0.6)
-                
-            except requests.exceptions.RequestException as e:
-                raise Exception(f"Ошибка API: {str(e)}")
-        
-        return self._format_results(vacancies)
-    
-    def get_vacancies_by_ids(self, vacancy_ids: List[str]) -> pd.DataFrame:
-        """Получает вакансии по списку ID"""
+            if page >= total_pages:
+                break
+        
+        if cached is not None:
+            self.result_cache.put(cached)
+    
+    def _fetch_page(self,
+                    keyword: str,
+                    area: int,
+                    page: int,
+                    selected_schedules: List[str],
+                    date_from: Optional[str] = None,
+                    date_to: Optional[str] = None) -> dict:
+        """Одна страница выдачи поиска (100 вакансий со сниппетами)"""
+        params = {
+            "text": keyword,
+            "page": page,
+            "per_page": 100,
+            "area": area,
+            "enable_snippets": "true"
+        }
+        
+        if selected_schedules:
+            params["schedule"] = selected_schedules
+        if date_from:
+            params["date_from"] = date_from
+        if date_to:
+            params["date_to"] = date_to
+        
+        try:
+            response = self.client.get(self.base_url, params=params, endpoint="search")
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Ошибка API: {str(e)}")
+    
+    def get_vacancies_incremental(self,
+                                  keyword: str,
+                                  area: int = 1,
+                                  stop_words: Optional[Union[str, List[str]]] = None,
+                                  schedules: Optional[Dict[str, bool]] = None,
+                                  progress_callback: Optional[Callable[[int, int], None]] = None,
+                                  store: Optional[DeltaStore] = None,
+                                  morphology: bool = False) -> pd.DataFrame:
+        """Дозагружает только вакансии, опубликованные после прошлого запуска, и объединяет с прежними
+        
+        Для каждого запроса хранится самая поздняя published_at; следующий запуск
+        передает ее в date_from, а результаты объединяются по ID (новые записи
+        заменяют старые).
+        """
+        store = store or DeltaStore()
+        stop_words_list = self._process_stop_words(stop_words)
+        # Стоп-слова входят в ключ: сохраненные записи уже отфильтрованы ими
+        query = {
+            "keyword": keyword,
+            "area": str(area),
+            "schedules": sorted(self._selected_schedules(schedules)),
+            "stop_words": stop_words_list,
+            "morphology": morphology
+        }
+        watermark, previous_records = store.load(query)
+        
+        new_records = []
+        pages = self._iter_pages(
+            keyword, area, stop_words_list, schedules, progress_callback, None, morphology, date_from=watermark
+        )
+        for _, _, items in pages:
+            for item in items:
+                published_at = item.get("published_at")
+                if published_at and (watermark is None or self._parse_date(published_at) > self._parse_date(watermark)):
+                    watermark = published_at
+                new_records.append(self._format_vacancy(item))
+        
+        merged = {record["Ссылка"]: record for record in new_records}
+        for record in previous_records:
+            merged.setdefault(record["Ссылка"], record)
+        records = list(merged.values())
+        
+        store.save(query, watermark, records)
+        return _records_to_frame(records)
+    
+    def get_vacancies_partitioned(self,
+                                  keyword: str,
+                                  area: int = 1,
+                                  stop_words: Optional[Union[str, List[str]]] = None,
+                                  schedules: Optional[Dict[str, bool]] = None,
+                                  progress_callback: Optional[Callable[[int, int], None]] = None,
+                                  detail_fields: Optional[List[str]] = None,
+                                  morphology: bool = False,
+                                  period_days: int = 365,
+                                  partition_workers: int = 2) -> pd.DataFrame:
+        """Поиск без ограничения глубины выдачи: насыщенный запрос делится по датам публикации
+        
+        Окно последних period_days дней рекурсивно делится пополам, пока в каждой
+        части не окажется не больше MAX_SEARCH_DEPTH вакансий. Части обходятся
+        параллельно, результаты объединяются по ID. progress_callback получает
+        (обработано частей, всего частей).
+        """
+        stop_words_list = self._process_stop_words(stop_words)
+        end = datetime.now(timezone.utc).replace(microsecond=0)
+        partitions = self._split_by_date(keyword, area, schedules, end - timedelta(days=period_days), end)
+        
+        def crawl(partition):
+            date_from, date_to = partition
+            pages = self._iter_pages(
+                keyword, area, stop_words_list, schedules, None, detail_fields, morphology,
+                date_from=self._format_date(date_from), date_to=self._format_date(date_to)
+            )
+            return [(str(item.get("id")), self._format_vacancy(item)) for _, _, items in pages for item in items]
+        
+        merged = {}
+        if progress_callback:
+            progress_callback(0, len(partitions))
+        with ThreadPoolExecutor(max_workers=max(1, partition_workers)) as executor:
+            for done, records in enumerate(executor.map(crawl, partitions), 1):
+                for vacancy_id, record in records:
+                    merged.setdefault(vacancy_id, record)
+                if progress_callback:
+                    progress_callback(done, len(partitions))
+        
+        return _records_to_frame(list(merged.values()))
+    
+    def get_vacancies_batch(self,
+                            queries: List[Union[SearchQuery, dict]],
+                            progress_callback: Optional[Callable[[int, int], None]] = None,
+                            detail_fields: Optional[List[str]] = None,
+                            typed: bool = False) -> BatchResult:
+        """Много запросов (ключевое слово, регион, фильтры) за один проход
+
+        Страницы и детали всех запросов идут через общий пул из max_workers потоков
+        и общий лимит запросов; вакансия, найденная несколькими запросами, загружается
+        один раз. Возвращает BatchResult: per_query - DataFrame по имени запроса,
+        merged - все вакансии без повторов со столбцом "Запросы", stats - счетчики,
+        failed - запросы, выдачу которых не удалось загрузить (остальные выполняются).
+        С description_processor навыки и ключевые слова проверяются по полным описаниям.
+        """
+        return BatchSearch(self, detail_fields, progress_callback).run(queries, typed=typed)
+    
+    def get_vacancies_by_ids(self,
+                             vacancy_ids: List[str],
+                             typed: bool = False,
+                             known_vacancies: Optional[Dict[str, dict]] = None) -> pd.DataFrame:
+        """Получает вакансии по списку ID
+        
+        known_vacancies: уже имеющиеся данные вакансий по ID (например, из файла-спутника
+        экспорта); из API загружаются только отсутствующие в нем.
+        """
+        known_vacancies = known_vacancies or {}
+        missing_ids = [vacancy_id for vacancy_id in vacancy_ids if str(vacancy_id) not in known_vacancies]
+        # Полные карточки сразу сжимаются до VacancyRecord, чтобы не держать их все в памяти
+        fetched = {}
+        for vacancy_id, vacancy_details in zip(missing_ids, self._iter_vacancies_details(missing_ids)):
+            if vacancy_details:
+                if self.raw_buffer is not None:
+                    self.raw_buffer.put(vacancy_id, vacancy_details)
+                fetched[vacancy_id] = VacancyRecord.from_payload(vacancy_details)
+        self._save_records(list(fetched.values()))
+        
         vacancies = []
         for vacancy_id in vacancy_ids:
-            try:
-                vacancy_details = self._get_vacancy_details(vacancy_id)
-                if vacancy_details:
-                    vacancies.append(vacancy_details)
-                time.sleep(0.2)
-            except Exception as e:
-                print(f"Ошибка при получении вакансии {vacancy_id}: {str(e)}")
+            vacancy_details = known_vacancies.get(str(vacancy_id)) or fetched.get(vacancy_id)
+            if vacancy_details:
+                vacancies.append(vacancy_details)
+        return self._format_results(vacancies, typed=typed)
+    
+    def search_offline(self,
+                       keyword: str,
+                       area: Optional[Union[str, int]] = None,
+                       stop_words: Optional[Union[str, List[str]]] = None,
+                       schedules: Optional[Dict[str, bool]] = None,
+                       morphology: bool = False,
+                       date_from: Optional[str] = None,
+                       typed: bool = False,
+                       raw_callback: Optional[Callable[[List[dict]], None]] = None,
+                       with_salary: bool = False,
+                       experience: Optional[List[str]] = None) -> pd.DataFrame:
+        """Поиск по локальному хранилищу (self.store) без обращения к API
         
-        return self._format_results(vacancies)
+        Фильтры те же, что у get_vacancies: ключевое слово и стоп-слова по названию
+        и сниппету, графики работы, дата публикации, зарплата и опыт. area=None - любой регион;
+        вложенные регионы не учитываются (113 не включает вакансии Москвы).
+        """
+        if self.store is None:
+            raise ValueError("Локальное хранилище вакансий не подключено")
+        
+        matcher = VacancyMatcher(keyword, self._process_stop_words(stop_words), morphology=morphology)
+        candidates = self.store.find(
+            keyword, area=area, schedules=self._selected_schedules(schedules),
+            date_from=date_from, with_salary=with_salary or None, experience=experience, morphology=morphology
+        )
+        with self.metrics.timer("filter_seconds"):
+            vacancies = [vacancy for vacancy in candidates if self._matches_filters(vacancy, matcher)]
+        if raw_callback:
+            raw_callback(vacancies)
+        return self._format_results(vacancies, typed=typed)
+    
+    def refilter(self,
+                 keyword: str,
+                 area: int = 1,
+                 stop_words: Optional[Union[str, List[str]]] = None,
+                 schedules: Optional[Dict[str, bool]] = None,
+                 morphology: bool = False,
+                 detail_fields: Optional[List[str]] = None,
+                 date_from: Optional[str] = None,
+                 with_salary: bool = False,
+                 experience: Optional[List[str]] = None,
+                 typed: bool = False,
+                 raw_callback: Optional[Callable[[List[dict]], None]] = None) -> Optional[pd.DataFrame]:
+        """Результат get_vacancies с другими фильтрами по сохраненной выдаче, без загрузки страниц
+        
+        Подходит выдача с тем же ключевым словом, регионом, date_from и detail_fields,
+        графики которой включают запрошенные. Детали загружаются только для вакансий,
+        которых не было в прежнем результате. Возвращает None, если такой выдачи нет
+        в result_cache - тогда нужен обычный поиск. Ключевое слово проверяется по
+        названию и сниппету, даже если при поиске работал разбор полных описаний.
+        """
+        if self.result_cache is None:
+            return None
+        selected_schedules = self._selected_schedules(schedules)
+        cached = self.result_cache.find(
+            SearchResultCache.make_key(keyword, area, date_from, None, detail_fields), selected_schedules
+        )
+        if cached is None:
+            return None
+        
+        matcher = VacancyMatcher(keyword, self._process_stop_words(stop_words), morphology=morphology)
+        with self.metrics.timer("filter_seconds"):
+            matched = [
+                item for item in cached.items
+                if (not selected_schedules or (item.schedule or {}).get("id") in selected_schedules)
+                and self._matches_fields(item, with_salary, experience)
+                and self._matches_filters(item, matcher)
+            ]
+        
+        missing = [item for item in matched if item.id not in cached.details]
+        if missing:
+            records = self._enrich_items(missing, detail_fields)
+            cached.details.update((record.id, record) for record in records)
+            self._save_records(records)
+        
+        vacancies = [cached.details[item.id] for item in matched]
+        if raw_callback:
+            raw_callback(vacancies)
+        return self._format_results(vacancies, typed=typed)
+    
+    @staticmethod
+    def _matches_fields(item: dict, with_salary: bool, experience: Optional[List[str]]) -> bool:
+        """Фильтры по полям вакансии: наличие зарплаты и опыт работы"""
+        if with_salary:
+            salary = item.get("salary") or {}
+            if not (salary.get("from") or salary.get("to")):
+                return False
+        if experience and (item.get("experience") or {}).get("id") not in experience:
+            return False
+        return True
+    
+    def _matches_filters(self, item: dict, matcher: VacancyMatcher) -> bool:
+        """Проверяет ключевое слово и стоп-слова по названию и сниппету вакансии"""
+        return matcher.matches(self._filter_text(item))
+    
+    @staticmethod
+    def _filter_text(item: dict) -> str:
+        title = (item.get("name") or "").lower()
+        snippet = item.get("snippet") or {}
+        requirement = (snippet.get("requirement") or "").lower()
+        responsibility = (snippet.get("responsibility") or "").lower()
+        return f"{title} {requirement} {responsibility}"
+    
+    def _save_records(self, records: List[VacancyRecord]):
+        """Новые вакансии обхода: в локальное хранилище и в статистику зарплат"""
+        if self.store is not None:
+            self.store.add(records)
+        if self.salary_analytics is not None:
+            self.salary_analytics.update(records)
+    
+    def _enrich_items(self,
+                      items: List[dict],
+                      detail_fields: Optional[List[str]] = None,
+                      matcher: Optional[VacancyMatcher] = None) -> List[VacancyRecord]:
+        """Строит компактные записи отфильтрованных вакансий, дополняя их данными из полной карточки
+        
+        Поля из detail_fields вне основного набора VacancyRecord сохраняются в record.extra.
+        Полные данные (с описанием) при заданном raw_buffer уходят на диск. С
+        description_processor в extra добавляются description_skills и, если передан
+        matcher, description_match (ключевое слово и стоп-слова по полному тексту).
+        """
+        if detail_fields is not None and not detail_fields:
+            details_list = [None] * len(items)
+        else:
+            details_list = self._get_vacancies_details([item.get("id") for item in items])
+        
+        records, descriptions = [], []
+        for item, vacancy_details in zip(items, details_list):
+            descriptions.append((vacancy_details or {}).get("description"))
+            # В буфер уходят полные детали, даже если в записи нужна только часть полей
+            if self.raw_buffer is not None:
+                self.raw_buffer.put(item.get("id"), {**item, **vacancy_details} if vacancy_details else dict(item))
+            if vacancy_details and detail_fields is not None:
+                vacancy_details = {field: vacancy_details[field] for field in detail_fields if field in vacancy_details}
+            records.append(VacancyRecord.from_payload(item, vacancy_details, extra_fields=detail_fields))
+        
+        if self.description_processor is not None and (detail_fields is None or detail_fields):
+            self._process_descriptions(records, items, descriptions, matcher)
+        return records
+    
+    def _process_descriptions(self,
+                              records: List[VacancyRecord],
+                              items: List[dict],
+                              descriptions: List[Optional[str]],
+                              matcher: Optional[VacancyMatcher]):
+        """Навыки и совпадение ключевого слова по полным описаниям (в пуле процессов)
+        
+        description_skills задается всем записям (пустой список без описания), чтобы
+        у всех порций результата были одинаковые столбцы; description_match - только
+        записям с описанием.
+        """
+        processor = self.description_processor
+        described = [index for index, description in enumerate(descriptions) if description]
+        with self.metrics.timer("description_stage_seconds"):
+            processed = processor.process(
+                [(descriptions[index], self._filter_text(items[index])) for index in described],
+                matcher if processor.full_text else None
+            )
+        results = [([], None, None)] * len(records)
+        for index, result in zip(described, processed):
+            results[index] = result
+        for record, (skills, matched, text) in zip(records, results):
+            extra = dict(record.extra or {})
+            extra["description_skills"] = skills
+            if matched is not None:
+                extra["description_match"] = matched
+            if text is not None:
+                extra["description_text"] = text
+            record.extra = extra
     
     def _get_vacancy_details(self, vacancy_id: str) -> dict:
-        """Получает полную информацию о вакансии"""
+        """Получает полную информацию о вакансии (с учетом кэша)"""
+        entry = self.cache.get(vacancy_id) if self.cache is not None else None
+        if entry and entry.fresh:
+            self.metrics.inc("detail_cache_hits_total")
+            return entry.payload
+        
+        # Устаревшую запись проверяем условным запросом
+        headers = {}
+        if entry:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        
         try:
-            response = requests.get(f"{self.base_url}/{vacancy_id}")
+            response = self.client.get(f"{self.base_url}/{vacancy_id}", headers=headers, endpoint="details")
+            if entry and response.status_code == 304:
+                self.metrics.inc("detail_revalidated_total")
+                self.cache.touch(vacancy_id)
+                return entry.payload
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException:
-            return {}
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            # Вакансия останется без деталей (или со старыми из кэша) - это видно в метриках
+            self.metrics.inc("detail_fetch_failures_total", error=type(e).__name__, stale=bool(entry))
+            return entry.payload if entry else {}
+        
+        if self.cache is not None and data:
+            self.cache.set(
+                vacancy_id, data,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        return data
+    
+    def _get_vacancies_details(self, vacancy_ids: List[str]) -> List[dict]:
+        """Получает детали вакансий пулом потоков, сохраняя порядок ID"""
+        return list(self._iter_vacancies_details(vacancy_ids))
+    
+    def _iter_vacancies_details(self, vacancy_ids: List[str]) -> Iterator[dict]:
+        """То же, но выдает детали по мере готовности, чтобы их можно было сразу обработать"""
+        if not vacancy_ids:
+            return
+        if self.max_workers == 1 or len(vacancy_ids) == 1:
+            yield from (self._get_vacancy_details(vacancy_id) for vacancy_id in vacancy_ids)
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(vacancy_ids))) as executor:
+            yield from executor.map(self._get_vacancy_details, vacancy_ids)
+    
+    def _count_found(self,
+                     keyword: str,
+                     area: int,
+                     schedules: Optional[Dict[str, bool]],
+                     date_from: datetime,
+                     date_to: datetime) -> int:
+        """Сколько вакансий API находит по запросу в окне дат"""
+        params = {
+            "text": keyword,
+            "page": 0,
+            "per_page": 1,
+            "area": area,
+            "date_from": self._format_date(date_from),
+            "date_to": self._format_date(date_to)
+        }
+        selected_schedules = self._selected_schedules(schedules)
+        if selected_schedules:
+            params["schedule"] = selected_schedules
+        
+        try:
+            response = self.client.get(self.base_url, params=params, endpoint="count")
+            response.raise_for_status()
+            return response.json().get("found", 0)
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Ошибка API: {str(e)}")
+    
+    def _split_by_date(self,
+                       keyword: str,
+                       area: int,
+                       schedules: Optional[Dict[str, bool]],
+                       start: datetime,
+                       end: datetime) -> List[tuple]:
+        """Делит окно дат пополам, пока каждая часть не уложится в MAX_SEARCH_DEPTH"""
+        partitions = []
+        stack = [(start, end)]
+        while stack:
+            date_from, date_to = stack.pop()
+            found = self._count_found(keyword, area, schedules, date_from, date_to)
+            if not found:
+                continue
+            if found <= self.MAX_SEARCH_DEPTH or date_to - date_from <= self.MIN_PARTITION:
+                partitions.append((date_from, date_to))
+                continue
+            middle = (date_from + (date_to - date_from) / 2).replace(microsecond=0)
+            stack.append((middle, date_to))
+            stack.append((date_from, middle))
+        
+        return sorted(partitions)
+    
+    @staticmethod
+    def _parse_date(value: str) -> datetime:
+        # HH отдает даты вида 2024-01-31T12:00:00+0300
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+    
+    @staticmethod
+    def _format_date(value: datetime) -> str:
+        # Тот же формат, что отдает HH: 2024-01-31T12:00:00+0000
+        return value.strftime("%Y-%m-%dT%H:%M:%S%z")
+    
+    def _selected_schedules(self, schedules: Optional[Dict[str, bool]]) -> List[str]:
+        if not schedules:
+            return []
+        return [self.schedule_mapping[key] for key, value in schedules.items() if value]
     
     def _process_stop_words(self, stop_words: Optional[Union[str, List[str]]]) -> List[str]:
         if not stop_words:
@@ -128,57 +738,66 @@ class HHParser:
         
         return [word.lower().strip() for word in stop_words if word.strip()]
     
-    def _format_results(self, vacancies: list) -> pd.DataFrame:
-        results = []
-        for vacancy in vacancies:
-            salary = vacancy.get("salary")
-            salary_str = self._format_salary(salary)
-            
-            # Опыт работы
-            experience = vacancy.get("experience", {})
-            experience_name = experience.get("name") if experience else "Не указан"
-            
-            # График работы
-            schedule = vacancy.get("schedule", {})
-            schedule_name = schedule.get("name") if schedule else "Не указан"
-            
-            # Контакты
-            contacts = vacancy.get("contacts")
-            contact_info = self._format_contacts(contacts)
-            
-            # Навыки
-            skills = [skill.get("name") for skill in vacancy.get("key_skills", [])]
-            
-            # Адрес
-            address = vacancy.get("address")
-            address_str = self._format_address(address)
-            
-            results.append({
-                "Компания": vacancy.get("employer", {}).get("name", "Не указано"),
-                "Вакансия": vacancy.get("name", "Без названия"),
-                "Зарплата": salary_str,
-                "Опыт работы": experience_name,
-                "График работы": schedule_name,
-                "Тип занятости": vacancy.get("employment", {}).get("name", "Не указан"),
-                "Ключевые навыки": ", ".join(skills) if skills else "Не указаны",
-                "Контакты": contact_info,
-                "Адрес": address_str,
-                "Ссылка": f"https://hh.ru/vacancy/{vacancy.get('id', '')}",
-                "Дата публикации": vacancy.get("published_at", "")[:10],
-                "Описание": self._get_description_snippet(vacancy.get("snippet", {}))
-            })
+    def _format_results(self, vacancies: list, typed: bool = False) -> pd.DataFrame:
+        with self.metrics.timer("format_seconds", typed=typed):
+            if typed:
+                from result_schema import build_typed_frame
+                return build_typed_frame(vacancies)
+            return _records_to_frame([self._format_vacancy(vacancy) for vacancy in vacancies])
+    
+    def _format_vacancy(self, vacancy: dict) -> dict:
+        salary = vacancy.get("salary")
+        salary_str = self._format_salary(salary)
         
-        return pd.DataFrame(results)
+        # Опыт работы
+        experience = vacancy.get("experience", {})
+        experience_name = experience.get("name") if experience else "Не указан"
+        
+        # График работы
+        schedule = vacancy.get("schedule", {})
+        schedule_name = schedule.get("name") if schedule else "Не указан"
+        
+        # Контакты
+        contacts = vacancy.get("contacts")
+        contact_info = self._format_contacts(contacts)
+        
+        # Навыки
+        skills = [skill.get("name") for skill in vacancy.get("key_skills", [])]
+        
+        # Адрес
+        address = vacancy.get("address")
+        address_str = self._format_address(address)
+        
+        record = {
+            "Компания": vacancy.get("employer", {}).get("name", "Не указано"),
+            "Вакансия": vacancy.get("name", "Без названия"),
+            "Зарплата": salary_str,
+            "Опыт работы": experience_name,
+            "График работы": schedule_name,
+            "Тип занятости": vacancy.get("employment", {}).get("name", "Не указан"),
+            "Ключевые навыки": ", ".join(skills) if skills else "Не указаны",
+            "Контакты": contact_info,
+            "Адрес": address_str,
+            "Ссылка": f"https://hh.ru/vacancy/{vacancy.get('id', '')}",
+            "Дата публикации": vacancy.get("published_at", "")[:10],
+            "Описание": self._get_description_snippet(vacancy.get("snippet", {}))
+        }
+        # Появляется, если включен разбор полных описаний
+        description_skills = vacancy.get("description_skills")
+        if description_skills is not None:
+            record["Навыки из описания"] = ", ".join(description_skills) if description_skills else "Не указаны"
+        return record
     
     def _format_salary(self, salary: dict) -> str:
         if not salary:
             return "Не указана"
-        from_sal = salary.get('from', '')
-        to_sal = salary.get('to', '')
-        currency = salary.get('currency', '')
+        from_sal = salary.get('from') or ''
+        to_sal = salary.get('to') or ''
+        currency = salary.get('currency') or ''
         return f"{from_sal}-{to_sal} {currency}" if from_sal or to_sal else "Не указана"
     
-    def _format_contacts(self, contacts: dict) -> str:
+    @staticmethod
+    def _format_contacts(contacts: dict) -> str:
         if not contacts:
             return "Не указаны"
         
@@ -194,7 +813,8 @@ class HHParser:
         
         return "\n".join(contact_parts) if contact_parts else "Не указаны"
     
-    def _format_address(self, address: dict) -> str:
+    @staticmethod
+    def _format_address(address: dict) -> str:
         if not address:
             return "Не указан"
         
@@ -205,7 +825,8 @@ class HHParser:
         parts = [part for part in [city, street, building] if part]
         return ", ".join(parts) if parts else "Не указан"
     
-    def _get_description_snippet(self, snippet: dict) -> str:
+    @staticmethod
+    def _get_description_snippet(snippet: dict) -> str:
         req = snippet.get("requirement", "") or ""
         resp = snippet.get("responsibility", "") or ""
         return f"{req} {resp}".strip()
\ No newline at end of file
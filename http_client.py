@@ -0,0 +1,142 @@
+import requests
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+
+from metrics import NullMetrics
+
+
+class RateLimiter:
+    """Token bucket, который снижает скорость при 429/503 и плавно восстанавливает ее"""
+
+    def __init__(self, rate: float = 5.0, burst: int = 5, min_rate: float = 0.5):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Блокирует поток, пока не появится токен на запрос"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """API попросил притормозить: уменьшаем скорость вдвое и ждем Retry-After"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class HHClient:
+    """Общий HTTP-клиент с пулом соединений, лимитом скорости и повторами"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self,
+                 pool_size: int = 4,
+                 rate: float = 5.0,
+                 max_retries: int = 4,
+                 backoff: float = 0.5,
+                 timeout: float = 15,
+                 metrics=None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        # Пачка без ожидания - не больше запросов, чем разрешено за секунду, сколько бы ни было потоков
+        self.limiter = RateLimiter(rate=rate, burst=max(1, min(pool_size, int(rate))))
+        self.metrics = metrics if metrics is not None else NullMetrics()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = "HHParser/1.0"
+
+    def get(self,
+            url: str,
+            params: Optional[dict] = None,
+            headers: Optional[Dict[str, str]] = None,
+            endpoint: str = "other") -> requests.Response:
+        """GET с повторами; после исчерпания попыток возвращает последний ответ или бросает ошибку сети
+
+        endpoint - метка для метрик (search, details, ...)
+        """
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            waited = time.perf_counter()
+            self.limiter.acquire()
+            started = time.perf_counter()
+            metrics.inc("rate_limit_wait_seconds_total", started - waited)
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                metrics.observe("http_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+                metrics.inc("http_errors_total", endpoint=endpoint, error=type(e).__name__)
+                if attempt >= self.max_retries:
+                    raise
+                metrics.inc("http_retries_total", endpoint=endpoint)
+                self._sleep_backoff(attempt)
+                attempt += 1
+                continue
+
+            metrics.observe("http_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+            metrics.inc("http_responses_total", endpoint=endpoint, status=response.status_code)
+            if response.status_code not in self.RETRY_STATUSES:
+                self.limiter.on_success()
+                return response
+
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code in (429, 503):
+                metrics.inc("http_throttled_total", endpoint=endpoint)
+                self.limiter.on_throttle(retry_after)
+            if attempt >= self.max_retries:
+                return response
+            metrics.inc("http_retries_total", endpoint=endpoint)
+            if retry_after is None:
+                self._sleep_backoff(attempt)
+            attempt += 1
+
+    def close(self):
+        self.session.close()
+
+    def _sleep_backoff(self, attempt: int):
+        # Экспоненциальная задержка с "full jitter"
+        time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,166 @@
+"""Метрики работы парсера: счетчики и гистограммы времени
+
+HHParser и HHClient пишут метрики через объект с методами inc(name, value,
+**labels) и observe(name, value, **labels). По умолчанию это Metrics,
+который хранит все в памяти и умеет выгружать JSON и текстовый формат
+Prometheus; можно передать свою реализацию (например, отправку в StatsD)
+или NullMetrics, чтобы ничего не собирать.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels_key(labels: dict) -> LabelsKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class NullMetrics:
+    """Ничего не собирает"""
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        yield
+
+
+class Metrics(NullMetrics):
+    """Потокобезопасное хранилище метрик в памяти"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelsKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelsKey, dict]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+                    break
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def counter(self, name: str, **labels) -> float:
+        """Значение счетчика; без меток - сумма по всем меткам"""
+        with self._lock:
+            series = self._counters.get(name, {})
+            if labels:
+                return series.get(_labels_key(labels), 0)
+            return sum(series.values())
+
+    def histogram_totals(self, name: str) -> Tuple[float, int]:
+        """(сумма, количество) наблюдений по всем меткам"""
+        with self._lock:
+            series = self._histograms.get(name, {}).values()
+            return sum(h["sum"] for h in series), sum(h["count"] for h in series)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = []
+                for key, histogram in series.items():
+                    cumulative, total = {}, 0
+                    for bound, count in zip(self.buckets, histogram["buckets"]):
+                        total += count
+                        cumulative[str(bound)] = total
+                    cumulative["+Inf"] = histogram["count"]
+                    histograms[name].append({
+                        "labels": dict(key),
+                        "buckets": cumulative,
+                        "sum": histogram["sum"],
+                        "count": histogram["count"]
+                    })
+        return {"counters": counters, "histograms": histograms}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix: str = "hhparser_") -> str:
+        """Текстовый формат экспозиции Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, series in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {prefix}{name} counter")
+            for item in series:
+                lines.append(f"{prefix}{name}{_prometheus_labels(item['labels'])} {item['value']}")
+        for name, series in sorted(snapshot["histograms"].items()):
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for item in series:
+                for bound, count in item["buckets"].items():
+                    labels = _prometheus_labels({**item["labels"], "le": bound})
+                    lines.append(f"{prefix}{name}_bucket{labels} {count}")
+                labels = _prometheus_labels(item["labels"])
+                lines.append(f"{prefix}{name}_sum{labels} {item['sum']}")
+                lines.append(f"{prefix}{name}_count{labels} {item['count']}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Короткая сводка для людей (используется в интерфейсе)"""
+        latency_sum, requests = self.histogram_totals("http_request_seconds")
+        format_sum, _ = self.histogram_totals("format_seconds")
+        items = self.counter("filter_items_total")
+        matched = self.counter("filter_matched_total")
+        lines = [
+            f"HTTP-запросов: {requests}",
+            f"Средняя задержка: {latency_sum / requests * 1000:.0f} мс" if requests else "Средняя задержка: -",
+            f"Повторов: {self.counter('http_retries_total'):.0f}",
+            f"Ответов 429/503: {self.counter('http_throttled_total'):.0f}",
+            f"Ожидание лимита: {self.counter('rate_limit_wait_seconds_total'):.1f} с",
+            f"Ошибок загрузки деталей: {self.counter('detail_fetch_failures_total'):.0f}",
+            f"Из кэша: {self.counter('detail_cache_hits_total'):.0f}",
+            f"Прошли фильтр: {matched:.0f} из {items:.0f}" + (f" ({matched / items * 100:.1f}%)" if items else ""),
+            f"Форматирование: {format_sum:.2f} с",
+        ]
+        return "\n".join(lines)
+
+
+def _prometheus_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
@@ -0,0 +1,198 @@
+"""Локальная замена API HH.ru для тестов производительности
+
+Отдает /vacancies и /vacancies/{id} с детерминированными данными:
+одинаковые параметры дают одинаковые вакансии. Можно задать задержку
+ответа, долю ошибок 500 и ограничение частоты запросов (ответ 429 с
+Retry-After).
+
+    with MockHHServer(vacancies=2000, latency=0.05) as server:
+        parser = HHParser()
+        parser.base_url = server.base_url
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+SKILLS = ["Python", "Django", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Git", "Linux",
+          "Redis", "Kafka", "SQL", "Celery", "REST API", "asyncio", "pandas", "Go"]
+EXPERIENCE = [("noExperience", "Нет опыта"), ("between1And3", "От 1 года до 3 лет"),
+              ("between3And6", "От 3 до 6 лет"), ("moreThan6", "Более 6 лет")]
+SCHEDULE = [("remote", "Удаленная работа"), ("flexible", "Гибкий график"), ("fullDay", "Полный день")]
+
+
+def make_search_item(vacancy_id: int, seed: int = 0) -> dict:
+    rng = random.Random(seed * 1000003 + vacancy_id)
+    title = rng.choice(["Python-разработчик", "Backend developer Python", "Senior Python Engineer",
+                        "Java-разработчик", "Data engineer"])
+    salary = None
+    if rng.random() < 0.6:
+        salary_from = rng.randrange(80, 400) * 1000
+        salary = {"from": salary_from, "to": salary_from + rng.randrange(0, 150) * 1000,
+                  "currency": rng.choice(["RUR", "RUR", "RUR", "USD"]), "gross": False}
+    schedule_id, schedule_name = rng.choice(SCHEDULE)
+    experience_id, experience_name = rng.choice(EXPERIENCE)
+    return {
+        "id": str(vacancy_id),
+        "name": title,
+        "area": {"id": "1", "name": "Москва"},
+        "salary": salary,
+        "employer": {"id": str(rng.randrange(1, 500)), "name": f"Компания {rng.randrange(1, 500)}"},
+        "schedule": {"id": schedule_id, "name": schedule_name},
+        "experience": {"id": experience_id, "name": experience_name},
+        "published_at": time.strftime("%Y-%m-%dT%H:%M:%S+0300",
+                                      time.gmtime(1760000000 - vacancy_id * 600)),
+        "snippet": {
+            "requirement": f"Опыт коммерческой разработки на python от {rng.randrange(1, 6)} лет.",
+            "responsibility": "Разработка и поддержка сервисов."
+        }
+    }
+
+
+def make_vacancy_details(vacancy_id: int, seed: int = 0) -> dict:
+    rng = random.Random(seed * 7919 + vacancy_id)
+    details = make_search_item(vacancy_id, seed)
+    skills = rng.sample(SKILLS, rng.randrange(0, 8))
+    details.update({
+        "key_skills": [{"name": skill} for skill in skills],
+        "employment": {"id": "full", "name": "Полная занятость"},
+        "contacts": {"name": "HR", "email": "hr@example.com", "phones": []} if rng.random() < 0.2 else None,
+        "address": {"city": "Москва", "street": "Тверская", "building": str(rng.randrange(1, 30))},
+        "description": ("<p>" + " ".join(f"<b>{skill}</b>" for skill in skills)
+                        + " Описание обязанностей, требований и условий работы.</p>") * 20
+    })
+    return details
+
+
+class MockHHServer:
+    """HTTP-сервер в отдельном потоке; счетчики запросов доступны в stats"""
+
+    def __init__(self,
+                 vacancies: int = 2000,
+                 latency: float = 0.0,
+                 error_rate: float = 0.0,
+                 max_rps: Optional[float] = None,
+                 retry_after: float = 1.0,
+                 max_depth: int = 2000,
+                 seed: int = 0):
+        self.vacancies = vacancies
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.max_depth = max_depth
+        self.seed = seed
+        self.stats = {"requests": 0, "search": 0, "details": 0, "errors": 0, "throttled": 0}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._tokens = max_rps or 0.0
+        self._updated = time.monotonic()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/vacancies"
+
+    def start(self) -> "MockHHServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def _admit(self) -> Optional[int]:
+        """Решает, ответить ли ошибкой: возвращает код ответа или None"""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.max_rps:
+                now = time.monotonic()
+                self._tokens = min(self.max_rps, self._tokens + (now - self._updated) * self.max_rps)
+                self._updated = now
+                if self._tokens < 1:
+                    self.stats["throttled"] += 1
+                    return 429
+                self._tokens -= 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return 500
+        return None
+
+    def _search(self, query: dict) -> dict:
+        page = int(query.get("page", ["0"])[0])
+        per_page = int(query.get("per_page", ["20"])[0])
+        visible = min(self.vacancies, self.max_depth)
+        start = page * per_page
+        ids = range(start, min(start + per_page, visible))
+        with self._lock:
+            self.stats["search"] += 1
+        return {
+            "items": [make_search_item(vacancy_id, self.seed) for vacancy_id in ids],
+            "found": self.vacancies,
+            "pages": -(-visible // per_page) if per_page else 0,
+            "page": page,
+            "per_page": per_page
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1, чтобы клиент мог переиспользовать соединения
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело уходят разными пакетами: без этого Nagle добавляет ~40 мс
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                status = server._admit()
+                if status:
+                    headers = {"Retry-After": str(server.retry_after)} if status == 429 else {}
+                    return self._send(status, {"errors": [{"type": "mock"}]}, headers)
+
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")
+                if parts == ["vacancies"]:
+                    return self._send(200, server._search(parse_qs(url.query)))
+                if len(parts) == 2 and parts[0] == "vacancies" and parts[1].isdigit():
+                    vacancy_id = int(parts[1])
+                    if vacancy_id >= server.vacancies:
+                        return self._send(404, {"errors": [{"type": "not_found"}]})
+                    with server._lock:
+                        server.stats["details"] += 1
+                    return self._send(200, make_vacancy_details(vacancy_id, server.seed))
+                return self._send(404, {"errors": [{"type": "not_found"}]})
+
+            def _send(self, status: int, payload: dict, headers: Optional[dict] = None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
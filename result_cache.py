@@ -0,0 +1,79 @@
+"""Выдача последних поисков до фильтров - для повторной фильтрации без загрузки
+
+HHParser(result_cache=SearchResultCache()) сохраняет сюда все вакансии каждой
+полностью пройденной выдачи (в виде VacancyRecord, до проверки ключевого слова
+и стоп-слов) и детали тех, что прошли фильтр. HHParser.refilter применяет новые стоп-слова,
+подмножество графиков, наличие зарплаты и опыт к сохраненной выдаче;
+детали догружаются только для вакансий, которых раньше не было в результате.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from vacancy_record import VacancyRecord
+
+
+class CachedSearch:
+    """Одна пройденная выдача: запрос, все ее вакансии и загруженные детали"""
+
+    __slots__ = ("key", "schedules", "items", "details", "created_at")
+
+    def __init__(self, key: str, schedules: List[str]):
+        self.key = key
+        # Графики, которыми была ограничена выдача (пусто - все)
+        self.schedules = set(schedules)
+        self.items: List[VacancyRecord] = []
+        self.details: Dict[str, VacancyRecord] = {}
+        self.created_at = time.time()
+
+    def covers(self, schedules: List[str]) -> bool:
+        """Можно ли получить выдачу с такими графиками фильтрацией этой"""
+        return not self.schedules or bool(schedules) and set(schedules) <= self.schedules
+
+
+class SearchResultCache:
+    """Несколько последних выдач в памяти (LRU), каждая живет не дольше ttl секунд"""
+
+    def __init__(self, max_searches: int = 3, ttl: float = 3600):
+        self.max_searches = max_searches
+        self.ttl = ttl
+        self._searches: "OrderedDict[tuple, CachedSearch]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(keyword: str,
+                 area,
+                 date_from: Optional[str] = None,
+                 date_to: Optional[str] = None,
+                 detail_fields: Optional[List[str]] = None) -> str:
+        return json.dumps([keyword.strip().lower(), str(area), date_from, date_to, detail_fields], ensure_ascii=False)
+
+    def put(self, search: CachedSearch):
+        with self._lock:
+            self._searches[(search.key, tuple(sorted(search.schedules)))] = search
+            self._searches.move_to_end((search.key, tuple(sorted(search.schedules))))
+            while len(self._searches) > self.max_searches:
+                self._searches.popitem(last=False)
+
+    def find(self, key: str, schedules: List[str]) -> Optional[CachedSearch]:
+        """Самая свежая выдача с тем же запросом, из которой можно получить нужные графики"""
+        now = time.time()
+        with self._lock:
+            for cache_key, search in reversed(list(self._searches.items())):
+                if now - search.created_at > self.ttl:
+                    del self._searches[cache_key]
+                    continue
+                if search.key == key and search.covers(schedules):
+                    self._searches.move_to_end(cache_key)
+                    return search
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._searches.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._searches)
@@ -0,0 +1,120 @@
+"""Типизированное представление результатов поиска
+
+build_typed_frame строит DataFrame по столбцам за один проход по вакансиям:
+числовые зарплаты, категориальные справочные поля, списки навыков и даты;
+при разборе описаний - еще список description_skills.
+to_display_frame получает из него привычные русские строковые столбцы,
+такие же, как у HHParser._format_results.
+"""
+from datetime import timedelta, timezone
+from typing import Dict, List
+
+import pandas as pd
+
+# Даты публикации HH отдает по московскому времени
+MOSCOW_TZ = timezone(timedelta(hours=3))
+
+CATEGORY_COLUMNS = ["currency", "experience", "schedule", "employment", "area"]
+TEXT_COLUMNS = ["id", "name", "employer", "contacts", "address", "snippet"]
+
+
+def _name(value) -> object:
+    return value.get("name") if value else None
+
+
+def typed_columns(vacancies: List[dict]) -> Dict[str, list]:
+    """Раскладывает сырые вакансии по столбцам"""
+    from hh_parser import HHParser
+
+    columns = {name: [] for name in [
+        "id", "name", "employer", "salary_from", "salary_to", "currency", "experience", "schedule",
+        "employment", "area", "skills", "contacts", "address", "published_at", "snippet", "description_skills"
+    ]}
+    for vacancy in vacancies:
+        salary = vacancy.get("salary") or {}
+        contacts = HHParser._format_contacts(vacancy.get("contacts"))
+        address = HHParser._format_address(vacancy.get("address"))
+        snippet = HHParser._get_description_snippet(vacancy.get("snippet") or {})
+
+        columns["id"].append(str(vacancy.get("id", "")))
+        columns["name"].append(vacancy.get("name"))
+        columns["employer"].append(_name(vacancy.get("employer")))
+        columns["salary_from"].append(salary.get("from"))
+        columns["salary_to"].append(salary.get("to"))
+        columns["currency"].append(salary.get("currency"))
+        columns["experience"].append(_name(vacancy.get("experience")))
+        columns["schedule"].append(_name(vacancy.get("schedule")))
+        columns["employment"].append(_name(vacancy.get("employment")))
+        columns["area"].append(_name(vacancy.get("area")))
+        columns["skills"].append([skill.get("name") for skill in vacancy.get("key_skills") or []])
+        columns["contacts"].append(None if contacts == "Не указаны" else contacts)
+        columns["address"].append(None if address == "Не указан" else address)
+        columns["published_at"].append(vacancy.get("published_at"))
+        columns["snippet"].append(snippet)
+        columns["description_skills"].append(vacancy.get("description_skills"))
+    if all(skills is None for skills in columns["description_skills"]):
+        # Столбец есть, только если описания разбирались (description_processing)
+        del columns["description_skills"]
+    return columns
+
+
+def build_typed_frame(vacancies: List[dict]) -> pd.DataFrame:
+    """Типизированный DataFrame из сырых вакансий (одно построение по столбцам)"""
+    columns = typed_columns(vacancies)
+    df = pd.DataFrame({
+        **{name: pd.Series(columns[name], dtype="object") for name in TEXT_COLUMNS},
+        "salary_from": pd.to_numeric(pd.Series(columns["salary_from"], dtype="object")).astype("Float64"),
+        "salary_to": pd.to_numeric(pd.Series(columns["salary_to"], dtype="object")).astype("Float64"),
+        **{name: pd.Series(columns[name], dtype="object").astype("category") for name in CATEGORY_COLUMNS},
+        "skills": pd.Series(columns["skills"], dtype="object"),
+        "published_at": pd.to_datetime(pd.Series(columns["published_at"], dtype="object"),
+                                       format="%Y-%m-%dT%H:%M:%S%z", utc=True, errors="coerce"),
+    })
+    if "description_skills" in columns:
+        df["description_skills"] = pd.Series(
+            [skills if skills is not None else [] for skills in columns["description_skills"]], dtype="object"
+        )
+    return df[["id", "name", "employer", "salary_from", "salary_to", "currency", "experience", "schedule",
+               "employment", "area", "skills", "contacts", "address", "published_at", "snippet"]
+              + (["description_skills"] if "description_skills" in columns else [])]
+
+
+def concat_typed(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Склеивает постраничные типизированные фреймы, сохраняя категориальные столбцы"""
+    if not frames:
+        return build_typed_frame([])
+    df = pd.concat(frames, ignore_index=True)
+    for name in CATEGORY_COLUMNS:
+        df[name] = df[name].astype("category")
+    return df
+
+
+def _number_text(series: pd.Series) -> pd.Series:
+    return series.round().astype("Int64").astype("string").fillna("")
+
+
+def to_display_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Русские строковые столбцы, как у HHParser._format_results"""
+    has_salary = df["salary_from"].notna() | df["salary_to"].notna()
+    salary = (_number_text(df["salary_from"]) + "-" + _number_text(df["salary_to"]) + " "
+              + df["currency"].astype("string").fillna(""))
+
+    display = pd.DataFrame({
+        "Компания": df["employer"].fillna("Не указано"),
+        "Вакансия": df["name"].fillna("Без названия"),
+        "Зарплата": salary.where(has_salary, "Не указана").astype(object),
+        "Опыт работы": df["experience"].astype(object).fillna("Не указан"),
+        "График работы": df["schedule"].astype(object).fillna("Не указан"),
+        "Тип занятости": df["employment"].astype(object).fillna("Не указан"),
+        "Ключевые навыки": df["skills"].map(lambda skills: ", ".join(skills) if skills else "Не указаны"),
+        "Контакты": df["contacts"].fillna("Не указаны"),
+        "Адрес": df["address"].fillna("Не указан"),
+        "Ссылка": "https://hh.ru/vacancy/" + df["id"].astype(object),
+        "Дата публикации": df["published_at"].dt.tz_convert(MOSCOW_TZ).dt.strftime("%Y-%m-%d").fillna(""),
+        "Описание": df["snippet"],
+    })
+    if "description_skills" in df.columns:
+        display["Навыки из описания"] = df["description_skills"].map(
+            lambda skills: ", ".join(skills) if skills else "Не указаны"
+        )
+    return display
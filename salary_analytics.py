@@ -0,0 +1,356 @@
+"""Потоковая статистика зарплат в рублях: медианы и перцентили по срезам
+
+Вилка вакансии (from/to в любой валюте) переводится в рубли по таблице
+курсов, которая хранится локально и раз в сутки обновляется из справочника
+HH (/dictionaries). Значением вакансии считается середина вилки или
+единственная указанная граница. Для каждого среза - опыт, график, регион,
+навык - ведется KLL-скетч квантилей: его размер почти не зависит от числа
+вакансий, а скетчи разных запусков можно объединять (merge) и сохранять.
+
+    analytics = SalaryAnalytics(CurrencyRates("currency_rates.json").load(parser.client))
+    parser = HHParser(salary_analytics=analytics)
+    parser.get_vacancies("python")
+    analytics.report("experience")   # Медиана, P10 ... P90 по опыту
+
+Одна и та же вакансия, найденная повторно, учитывается повторно; полная
+история без повторов - SalaryAnalytics.update(store) по VacancyStore.
+"""
+import json
+import math
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from skill_analytics import explode_skills, salary_columns
+
+DICTIONARIES_URL = "https://api.hh.ru/dictionaries"
+# Примерные курсы (единиц валюты за рубль, как в справочнике HH) - если справочник недоступен
+DEFAULT_RATES = {
+    "RUR": 1.0, "USD": 0.0111, "EUR": 0.0102, "KZT": 5.7, "BYR": 0.036, "UAH": 0.46,
+    "UZS": 142.0, "AZN": 0.0189, "GEL": 0.0301, "KGS": 0.97
+}
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+DIMENSIONS = {
+    "all": "Все вакансии",
+    "experience": "Опыт работы",
+    "schedule": "График работы",
+    "area": "Регион",
+    "skill": "Навык"
+}
+
+
+class CurrencyRates:
+    """Курсы валют справочника HH с локальным кэшем в JSON-файле
+
+    path=None - только курсы по умолчанию, без файла. Файл старше max_age
+    секунд обновляется при load(client); если справочник недоступен,
+    используются старые курсы из файла или DEFAULT_RATES.
+    """
+
+    def __init__(self, path: Optional[str] = "currency_rates.json", max_age: float = 86400):
+        self.path = path
+        self.max_age = max_age
+        self.rates: Dict[str, float] = dict(DEFAULT_RATES)
+        self.updated_at: Optional[float] = None
+
+    def load(self, client=None) -> "CurrencyRates":
+        cached = self._read()
+        if cached is not None:
+            self.rates, self.updated_at = cached
+        if client is not None and (self.updated_at is None or time.time() - self.updated_at > self.max_age):
+            try:
+                self.refresh(client)
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+        return self
+
+    def refresh(self, client):
+        """Загружает курсы из справочника HH и сохраняет их в файл"""
+        response = client.get(DICTIONARIES_URL, endpoint="dictionaries")
+        response.raise_for_status()
+        rates = {
+            item["code"]: float(item["rate"])
+            for item in response.json().get("currency", []) if item.get("code") and item.get("rate")
+        }
+        if not rates:
+            raise ValueError("В справочнике HH нет курсов валют")
+        self.rates, self.updated_at = rates, time.time()
+        if self.path:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"updated_at": self.updated_at, "rates": rates}, f, ensure_ascii=False, indent=2)
+
+    def to_rub(self, amount, currency: Optional[str]) -> Optional[float]:
+        """Сумма в рублях; None для пустой суммы и неизвестной валюты"""
+        rate = self.rates.get(currency or "RUR")
+        if amount is None or pd.isna(amount) or not rate:
+            return None
+        return float(amount) / rate
+
+    def _read(self) -> Optional[Tuple[Dict[str, float], float]]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {code: float(rate) for code, rate in data["rates"].items()}, float(data["updated_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def normalize_salary(salary: Optional[dict],
+                     rates: CurrencyRates) -> Optional[Tuple[Optional[float], Optional[float]]]:
+    """Вилка API {"from", "to", "currency"} -> (от, до) в рублях; None без зарплаты или курса"""
+    if not salary:
+        return None
+    low = rates.to_rub(salary.get("from"), salary.get("currency"))
+    high = rates.to_rub(salary.get("to"), salary.get("currency"))
+    return (low, high) if low is not None or high is not None else None
+
+
+def salary_value(low: Optional[float], high: Optional[float]) -> Optional[float]:
+    """Одно число для вилки: середина или единственная граница"""
+    if low is not None and high is not None:
+        return (low + high) / 2
+    return low if low is not None else high
+
+
+def frame_salaries(df: pd.DataFrame, rates: CurrencyRates) -> pd.Series:
+    """Зарплата в рублях (середина вилки) по строкам DataFrame HHParser; NA - нет зарплаты или курса"""
+    salary = salary_columns(df)
+    rate = salary["currency"].fillna("RUR").map(rates.rates).astype("Float64")
+    return salary[["salary_from", "salary_to"]].div(rate, axis=0).mean(axis=1, skipna=True)
+
+
+class KLLSketch:
+    """Скетч квантилей KLL (Karnin, Lang, Liberty): O(k) значений, объединяется через merge
+
+    Значения хранятся уровнями; при переполнении уровень сортируется и каждое
+    второе значение (со случайным сдвигом) переходит на следующий уровень с
+    удвоенным весом. Ошибка ранга - порядка 1/k, точные min и max хранятся отдельно.
+    """
+
+    __slots__ = ("k", "levels", "count", "min", "max", "_size", "_max_size")
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.levels: List[List[float]] = []
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._size = 0
+        self._max_size = 0
+        self._grow()
+
+    def _grow(self):
+        self.levels.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def _capacity(self, level: int) -> int:
+        # Нижние уровни короче: емкость убывает как (2/3)^глубина от верхнего
+        return int(math.ceil(self.k * (2 / 3) ** (len(self.levels) - level - 1))) + 1
+
+    def update(self, value: float):
+        self.levels[0].append(value)
+        self.count += 1
+        self._size += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        while self._size >= self._max_size:
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    if level + 1 >= len(self.levels):
+                        self._grow()
+                    items.sort()
+                    # При нечетной длине последнее значение остается на уровне
+                    odd = items.pop() if len(items) % 2 else None
+                    self.levels[level + 1].extend(items[random.getrandbits(1)::2])
+                    self.levels[level] = [odd] if odd is not None else []
+                    break
+            self._size = sum(len(items) for items in self.levels)
+
+    def merge(self, other: "KLLSketch"):
+        """Добавляет к скетчу значения другого (other не меняется)"""
+        if not other.count:
+            return
+        while len(self.levels) < len(other.levels):
+            self._grow()
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._size = sum(len(items) for items in self.levels)
+        self._compress()
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        qs = list(qs)
+        if not self.count:
+            return [None] * len(qs)
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+                continue
+            if q >= 1:
+                results.append(self.max)
+                continue
+            target, seen = q * total, 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    results.append(value)
+                    break
+        return results
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "count": self.count, "min": self.min, "max": self.max, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        sketch = cls(data["k"])
+        sketch.levels = [list(items) for items in data["levels"]] or [[]]
+        sketch.count, sketch.min, sketch.max = data["count"], data["min"], data["max"]
+        sketch._max_size = sum(sketch._capacity(level) for level in range(len(sketch.levels)))
+        sketch._size = sum(len(items) for items in sketch.levels)
+        return sketch
+
+
+class SalaryAnalytics:
+    """Скетчи зарплат в рублях: общий и по каждому значению опыта, графика, региона и навыка
+
+    Принимает вакансии API и VacancyRecord (add/update) или DataFrame
+    HHParser (add_frame). Скетчи разных экземпляров объединяются merge,
+    сохраняются save и загружаются load.
+    """
+
+    def __init__(self, rates: Optional[CurrencyRates] = None, k: int = 200):
+        self.rates = rates if rates is not None else CurrencyRates(path=None)
+        self.k = k
+        # (срез, значение) -> скетч; срез "all" - все вакансии с зарплатой
+        self.sketches: Dict[Tuple[str, str], KLLSketch] = {}
+        # Вакансии без зарплаты или в валюте без курса
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def add(self, vacancy) -> bool:
+        """Учитывает вакансию; False, если у нее нет зарплаты, которую можно перевести в рубли"""
+        salary_range = normalize_salary(vacancy.get("salary"), self.rates)
+        skills = [skill.get("name") for skill in vacancy.get("key_skills") or [] if skill.get("name")]
+        skills += vacancy.get("description_skills") or []
+        keys = [
+            ("experience", (vacancy.get("experience") or {}).get("name")),
+            ("schedule", (vacancy.get("schedule") or {}).get("name")),
+            ("area", (vacancy.get("area") or {}).get("name")),
+            *(("skill", skill) for skill in dict.fromkeys(skills))
+        ]
+        value = salary_value(*salary_range) if salary_range else None
+        return self._add_value(value, keys)
+
+    def update(self, vacancies: Iterable) -> int:
+        """Учитывает поток вакансий (например, VacancyStore); возвращает число учтенных"""
+        return sum(1 for vacancy in vacancies if self.add(vacancy))
+
+    def add_frame(self, df: pd.DataFrame) -> int:
+        """То же для DataFrame HHParser: обычного (без региона) или типизированного"""
+        if df.empty:
+            return 0
+        values = frame_salaries(df, self.rates)
+        typed = "salary_from" in df.columns
+        columns = {"experience": "experience" if typed else "Опыт работы",
+                   "schedule": "schedule" if typed else "График работы",
+                   "area": "area" if typed else None}
+        skills = explode_skills(df).groupby("vacancy")["skill"].agg(list)
+
+        added = 0
+        for index, value in values.items():
+            keys = [(dimension, df.at[index, column]) for dimension, column in columns.items() if column]
+            keys += [("skill", skill) for skill in skills.get(index, [])]
+            added += self._add_value(None if pd.isna(value) else float(value), keys)
+        return added
+
+    def _add_value(self, value: Optional[float], keys: List[Tuple[str, Optional[str]]]) -> bool:
+        with self._lock:
+            if value is None:
+                self.skipped += 1
+                return False
+            for key in [("all", "")] + [(dimension, str(name)) for dimension, name in keys
+                                        if name is not None and not pd.isna(name)]:
+                sketch = self.sketches.get(key)
+                if sketch is None:
+                    sketch = self.sketches[key] = KLLSketch(self.k)
+                sketch.update(value)
+            return True
+
+    def merge(self, other: "SalaryAnalytics"):
+        with self._lock:
+            for key, sketch in other.sketches.items():
+                self.sketches.setdefault(key, KLLSketch(self.k)).merge(sketch)
+            self.skipped += other.skipped
+
+    def quantiles(self,
+                  dimension: str = "all",
+                  value: str = "",
+                  qs: Iterable[float] = DEFAULT_QUANTILES) -> List[Optional[float]]:
+        qs = list(qs)
+        sketch = self.sketches.get((dimension, value))
+        return sketch.quantiles(qs) if sketch else [None] * len(qs)
+
+    def median(self, dimension: str = "all", value: str = "") -> Optional[float]:
+        return self.quantiles(dimension, value, [0.5])[0]
+
+    def report(self,
+               dimension: Optional[str] = None,
+               quantiles: Iterable[float] = DEFAULT_QUANTILES,
+               min_count: int = 1) -> pd.DataFrame:
+        """Таблица "Срез", "Значение", "Вакансий", P10 ... P90 (P50 - "Медиана"), по убыванию числа вакансий"""
+        if dimension is not None and dimension not in DIMENSIONS:
+            raise ValueError(f"Неизвестный срез: {dimension}")
+        quantiles = list(quantiles)
+        labels = ["Медиана" if q == 0.5 else f"P{round(q * 100):g}" for q in quantiles]
+        with self._lock:
+            items = [(key, sketch) for key, sketch in self.sketches.items()
+                     if (dimension is None or key[0] == dimension) and sketch.count >= min_count]
+            rows = [
+                [DIMENSIONS[key[0]], key[1], sketch.count,
+                 *(round(value) if value is not None else None for value in sketch.quantiles(quantiles))]
+                for key, sketch in items
+            ]
+        df = pd.DataFrame(rows, columns=["Срез", "Значение", "Вакансий", *labels])
+        order = {name: position for position, name in enumerate(DIMENSIONS.values())}
+        df = df.assign(_order=df["Срез"].map(order)).sort_values(["_order", "Вакансий"], ascending=[True, False])
+        return df.drop(columns="_order").reset_index(drop=True)
+
+    def save(self, path: str):
+        with self._lock:
+            data = {
+                "k": self.k,
+                "skipped": self.skipped,
+                "sketches": [[key[0], key[1], sketch.to_dict()] for key, sketch in self.sketches.items()]
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, rates: Optional[CurrencyRates] = None) -> "SalaryAnalytics":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        analytics = cls(rates, k=data["k"])
+        analytics.skipped = data["skipped"]
+        analytics.sketches = {
+            (dimension, value): KLLSketch.from_dict(sketch) for dimension, value, sketch in data["sketches"]
+        }
+        return analytics
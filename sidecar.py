@@ -0,0 +1,85 @@
+"""Файл-спутник с исходными данными вакансий рядом с экспортом
+
+Рядом с "вакансии.xlsx" сохраняется "вакансии.xlsx.vacancies.jsonl.gz":
+сжатый JSONL, по строке на вакансию, только с полями, нужными для
+HHParser._format_results и статистики навыков. Статистика по файлу
+читает его вместо повторной загрузки вакансий из API.
+"""
+import gzip
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+SIDECAR_SUFFIX = ".vacancies.jsonl.gz"
+
+# Поля сырой вакансии, которых достаточно для всех форматов результатов
+COMPACT_FIELDS = [
+    "id", "name", "employer", "salary", "experience", "schedule", "employment", "key_skills",
+    "contacts", "address", "area", "published_at", "snippet"
+]
+
+
+def sidecar_path(export_path: str) -> str:
+    return export_path + SIDECAR_SUFFIX
+
+
+def compact_vacancy(vacancy: dict) -> dict:
+    """Оставляет только нужные поля; у работодателя и региона - только id и название"""
+    compact = {field: vacancy[field] for field in COMPACT_FIELDS if vacancy.get(field) is not None}
+    for field in ("employer", "area"):
+        if isinstance(compact.get(field), dict):
+            compact[field] = {key: compact[field].get(key) for key in ("id", "name")}
+    return compact
+
+
+class SidecarWriter:
+    """Потоково пишет сжатые записи вакансий"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self.count = 0
+
+    def write(self, vacancies: List[dict]):
+        fetched_at = time.time()
+        for vacancy in vacancies:
+            record = compact_vacancy(vacancy)
+            record["_fetched_at"] = vacancy.get("_fetched_at", fetched_at)
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_sidecar(export_path: str, vacancies: List[dict]) -> str:
+    path = sidecar_path(export_path)
+    with SidecarWriter(path) as writer:
+        writer.write(vacancies)
+    return path
+
+
+def read_sidecar(export_path: str, max_age: Optional[float] = 7 * 24 * 3600) -> Dict[str, dict]:
+    """Вакансии из файла-спутника по ID; устаревшие (старше max_age) пропускаются"""
+    path = sidecar_path(export_path)
+    if not os.path.exists(path):
+        return {}
+
+    now = time.time()
+    vacancies = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if max_age is not None and now - record.get("_fetched_at", 0) > max_age:
+                continue
+            vacancies[str(record.get("id"))] = record
+    return vacancies
@@ -0,0 +1,132 @@
+"""Аналитика ключевых навыков по результатам поиска
+
+Функции принимают как обычный DataFrame HHParser (столбец "Ключевые навыки"
+со строкой через запятую), так и типизированный из result_schema (столбец
+skills со списками). Все подсчеты выполняются через explode/groupby без
+циклов по строкам.
+"""
+import numpy as np
+import pandas as pd
+
+NO_SKILLS = "Не указаны"
+DESCRIPTION_SKILLS = "Навыки из описания"
+_SALARY_RE = r'^(?P<salary_from>\d*)-(?P<salary_to>\d*) (?P<currency>\S*)$'
+
+
+def explode_skills(df: pd.DataFrame) -> pd.DataFrame:
+    """По строке на пару (вакансия, навык): столбцы vacancy (индекс строки) и skill"""
+    if "skills" in df.columns:
+        skills = df["skills"]
+    elif "Ключевые навыки" in df.columns:
+        skills = df["Ключевые навыки"].astype("string").where(lambda s: s != NO_SKILLS).str.split(",")
+    else:
+        raise ValueError("В данных нет столбца с ключевыми навыками")
+
+    exploded = skills.explode()
+    if "description_skills" in df.columns:
+        exploded = pd.concat([exploded, df["description_skills"].explode()])
+    elif DESCRIPTION_SKILLS in df.columns:
+        # Навыки, найденные в полном описании (description_processing), дополняют key_skills
+        found = df[DESCRIPTION_SKILLS].astype("string").where(lambda s: s != NO_SKILLS).str.split(",")
+        exploded = pd.concat([exploded, found.explode()])
+    exploded = exploded.dropna().astype(str).str.strip()
+    exploded = exploded[exploded != ""]
+    return pd.DataFrame({"vacancy": exploded.index, "skill": exploded.to_numpy()}).drop_duplicates()
+
+
+def skill_frequencies(df: pd.DataFrame) -> pd.DataFrame:
+    """Частота навыков: столбцы "Навык" и "Частота", по убыванию"""
+    counts = explode_skills(df)["skill"].value_counts()
+    return pd.DataFrame({"Навык": counts.index, "Частота": counts.to_numpy()})
+
+
+def skill_cooccurrence(df: pd.DataFrame, min_count: int = 1) -> pd.DataFrame:
+    """Пары навыков, встречающихся в одной вакансии: "Навык 1", "Навык 2", "Совместно"
+
+    Считается самосоединением по вакансии, поэтому стоимость пропорциональна
+    числу реальных пар, а не квадрату числа навыков.
+    """
+    pairs = explode_skills(df)
+    pairs = pairs.merge(pairs, on="vacancy", suffixes=("_1", "_2"))
+    pairs = pairs[pairs["skill_1"] < pairs["skill_2"]]
+    counts = pairs.groupby(["skill_1", "skill_2"]).size()
+    counts = counts[counts >= min_count].sort_values(ascending=False)
+    return pd.DataFrame({
+        "Навык 1": counts.index.get_level_values(0),
+        "Навык 2": counts.index.get_level_values(1),
+        "Совместно": counts.to_numpy()
+    })
+
+
+def cooccurrence_matrix(df: pd.DataFrame, min_count: int = 1) -> pd.DataFrame:
+    """Симметричная матрица навык x навык с разреженными (SparseDtype) столбцами
+
+    Столбцы собираются сразу разреженными из списка пар (по коду навыка),
+    без промежуточной плотной матрицы навык x навык.
+    """
+    pairs = skill_cooccurrence(df, min_count)
+    skills = pd.Index(pd.concat([pairs["Навык 1"], pairs["Навык 2"]]).unique()).sort_values()
+    first = skills.get_indexer(pairs["Навык 1"])
+    second = skills.get_indexer(pairs["Навык 2"])
+    rows = np.concatenate([first, second])
+    columns = np.concatenate([second, first])
+    counts = np.tile(pairs["Совместно"].to_numpy(dtype=float), 2)
+
+    order = np.lexsort((rows, columns))
+    rows, columns, counts = rows[order], columns[order], counts[order]
+    bounds = np.searchsorted(columns, np.arange(len(skills) + 1))
+    return pd.DataFrame({
+        skill: _sparse_column(len(skills), rows[start:end], counts[start:end])
+        for skill, start, end in zip(skills, bounds[:-1], bounds[1:])
+    }, index=skills)
+
+
+def _sparse_column(length: int, positions: np.ndarray, values: np.ndarray) -> pd.arrays.SparseArray:
+    # Плотным бывает только один столбец за раз: O(S) памяти, а не O(S^2)
+    column = np.full(length, np.nan)
+    column[positions] = values
+    return pd.arrays.SparseArray(column, fill_value=np.nan)
+
+
+def salary_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Числовые salary_from, salary_to, currency из типизированных или строковых данных"""
+    if "salary_from" in df.columns:
+        return df[["salary_from", "salary_to", "currency"]].astype(
+            {"salary_from": "Float64", "salary_to": "Float64", "currency": "string"}
+        )
+
+    parsed = df["Зарплата"].astype("string").str.extract(_SALARY_RE)
+    return pd.DataFrame({
+        "salary_from": pd.to_numeric(parsed["salary_from"].replace("", pd.NA)).astype("Float64"),
+        "salary_to": pd.to_numeric(parsed["salary_to"].replace("", pd.NA)).astype("Float64"),
+        "currency": parsed["currency"]
+    }, index=df.index)
+
+
+def skill_salary_stats(df: pd.DataFrame, currency: str = "RUR", min_count: int = 1) -> pd.DataFrame:
+    """Зарплата по навыкам (середина вилки, только в указанной валюте)"""
+    salary = salary_columns(df)
+    midpoint = salary[["salary_from", "salary_to"]].mean(axis=1, skipna=True)
+    midpoint = midpoint[(salary["currency"] == currency).fillna(False) & midpoint.notna()]
+
+    skills = explode_skills(df)
+    skills = skills[skills["vacancy"].isin(midpoint.index)]
+    skills["salary"] = midpoint.reindex(skills["vacancy"]).to_numpy(dtype=float)
+    stats = skills.groupby("skill")["salary"].agg(["count", "median", "mean", "min", "max"])
+    stats = stats[stats["count"] >= min_count].sort_values("count", ascending=False)
+    stats.index.name = "Навык"
+    return stats.rename(columns={
+        "count": "Вакансий", "median": "Медиана", "mean": "Среднее", "min": "Минимум", "max": "Максимум"
+    })
+
+
+def skill_by_experience(df: pd.DataFrame) -> pd.DataFrame:
+    """Число вакансий с навыком в разрезе требуемого опыта"""
+    column = "experience" if "experience" in df.columns else "Опыт работы"
+    skills = explode_skills(df)
+    skills["experience"] = df[column].astype(object).reindex(skills["vacancy"]).to_numpy()
+    table = pd.crosstab(skills["skill"], skills["experience"].fillna("Не указан"))
+    table = table.loc[table.sum(axis=1).sort_values(ascending=False).index]
+    table.index.name = "Навык"
+    table.columns.name = "Опыт работы"
+    return table
@@ -0,0 +1,62 @@
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from salary_analytics import CurrencyRates, KLLSketch, frame_salaries
+
+
+class SummaryStats:
+    """Показатели панели информации, накапливаемые по частям результатов
+
+    Каждая порция (страница или весь DataFrame) просматривается один раз:
+    по столбцу на показатель, без повторных фильтраций по категориям.
+    """
+
+    def __init__(self, rates: Optional[CurrencyRates] = None):
+        self.rates = rates if rates is not None else CurrencyRates(path=None)
+        self.total = 0
+        self.with_salary = 0
+        self.with_contacts = 0
+        self.last_date: Optional[str] = None
+        self.experience = Counter()
+        self.schedule = Counter()
+        # Зарплаты в рублях для медианы без хранения всех значений
+        self.salaries = KLLSketch()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, rates: Optional[CurrencyRates] = None) -> "SummaryStats":
+        stats = cls(rates)
+        stats.update(df)
+        return stats
+
+    def update(self, df: pd.DataFrame):
+        """Добавляет порцию вакансий к накопленной статистике"""
+        if df.empty:
+            return
+
+        self.total += len(df)
+        self.with_salary += int((df["Зарплата"] != "Не указана").sum())
+        self.with_contacts += int((df["Контакты"] != "Не указаны").sum())
+        self.experience.update(df["Опыт работы"].value_counts().to_dict())
+        self.schedule.update(df["График работы"].value_counts().to_dict())
+        for value in frame_salaries(df, self.rates).dropna():
+            self.salaries.update(float(value))
+
+        chunk_last_date = df["Дата публикации"].max()
+        if pd.notna(chunk_last_date) and (self.last_date is None or chunk_last_date > self.last_date):
+            self.last_date = chunk_last_date
+
+    def median_salary(self) -> Optional[float]:
+        """Медиана зарплаты в рублях (середина вилки) или None, если зарплат нет"""
+        return self.salaries.quantile(0.5)
+
+    def percent(self, count: int) -> float:
+        return round(count / self.total * 100, 1) if self.total else 0.0
+
+    def experience_items(self) -> List[Tuple[str, int, float]]:
+        """(опыт, число вакансий, процент) по убыванию числа вакансий"""
+        return [(name, count, self.percent(count)) for name, count in self.experience.most_common()]
+
+    def schedule_items(self) -> List[Tuple[str, int, float]]:
+        return [(name, count, self.percent(count)) for name, count in self.schedule.most_common()]
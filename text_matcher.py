@@ -0,0 +1,66 @@
+import re
+from typing import List, Optional
+
+# Типичные окончания русских слов, от длинных к коротким
+_RU_ENDINGS = sorted({
+    "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими", "ией", "иям", "иях",
+    "ость", "ости", "ов", "ев", "ей", "ам", "ям", "ах", "ях", "ой", "ий", "ый", "ая", "яя",
+    "ое", "ее", "ые", "ие", "ую", "юю", "ом", "ем", "ию", "ия",
+    "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й"
+}, key=len, reverse=True)
+_CYRILLIC_WORD = re.compile(r'^[а-яё]+$')
+_MIN_STEM = 3
+
+
+def stem_ru(word: str) -> str:
+    """Отбрасывает окончание русского слова (упрощенный стемминг без словарей)"""
+    if not _CYRILLIC_WORD.match(word):
+        return word
+    for ending in _RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+            return word[:-len(ending)]
+    return word
+
+
+class VacancyMatcher:
+    """Ключевое слово и стоп-слова, скомпилированные один раз на поиск
+
+    Все стоп-слова проверяются одним регулярным выражением-альтернацией.
+    При morphology=True русские слова сравниваются по основе, так что
+    "стажер" находит и "стажера", и "стажеров".
+    """
+
+    def __init__(self, keyword: str, stop_words: Optional[List[str]] = None, morphology: bool = False):
+        self.morphology = morphology
+        self.keyword_pattern = self._compile([keyword.lower()])
+        self.stop_pattern = self._compile([word.lower() for word in stop_words or []])
+
+    def keyword_found(self, text: str) -> bool:
+        return bool(self.keyword_pattern and self.keyword_pattern.search(text))
+
+    def stop_word_found(self, text: str) -> bool:
+        return bool(self.stop_pattern and self.stop_pattern.search(text))
+
+    def matches(self, text: str) -> bool:
+        """Текст (в нижнем регистре) содержит ключевое слово и не содержит стоп-слов"""
+        return bool(text.strip()) and self.keyword_found(text) and not self.stop_word_found(text)
+
+    def _compile(self, words: List[str]) -> Optional["re.Pattern"]:
+        words = [word for word in words if word]
+        if not words:
+            return None
+        # Длинные варианты первыми, чтобы альтернация не отсекала их короткими
+        alternatives = sorted({self._word_pattern(word) for word in words}, key=len, reverse=True)
+        return re.compile(rf'\b(?:{"|".join(alternatives)})\b')
+
+    def _word_pattern(self, word: str) -> str:
+        if not self.morphology:
+            return re.escape(word)
+
+        parts = []
+        for token in word.split():
+            if _CYRILLIC_WORD.match(token):
+                parts.append(re.escape(stem_ru(token)) + r'[а-яё]*')
+            else:
+                parts.append(re.escape(token))
+        return r'\s+'.join(parts)
@@ -0,0 +1,112 @@
+import sqlite3
+import json
+import time
+import threading
+from typing import Optional, NamedTuple
+
+
+class CacheEntry(NamedTuple):
+    payload: dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+
+class VacancyCache:
+    """Постоянный кэш деталей вакансий в файле SQLite"""
+
+    def __init__(self, path: str = "vacancy_cache.sqlite3", ttl: float = 24 * 3600, max_entries: int = 100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS vacancies (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_vacancies_accessed ON vacancies (accessed_at)")
+        self._conn.commit()
+
+    def get(self, vacancy_id: str) -> Optional[CacheEntry]:
+        """Возвращает запись кэша (в том числе устаревшую) или None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, etag, last_modified, expires_at FROM vacancies WHERE id = ?",
+                (str(vacancy_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE vacancies SET accessed_at = ? WHERE id = ?", (time.time(), str(vacancy_id)))
+            self._conn.commit()
+        payload, etag, last_modified, expires_at = row
+        return CacheEntry(json.loads(payload), etag, last_modified, expires_at)
+
+    def set(self,
+            vacancy_id: str,
+            payload: dict,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None,
+            ttl: Optional[float] = None):
+        """Сохраняет детали вакансии со своим сроком жизни"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO vacancies (id, payload, etag, last_modified, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(vacancy_id), json.dumps(payload, ensure_ascii=False), etag, last_modified, expires_at, now)
+            )
+            self._writes += 1
+            # Проверяем размер не на каждой записи, чтобы не считать строки постоянно
+            if self._writes % 100 == 0:
+                self._evict()
+            self._conn.commit()
+
+    def touch(self, vacancy_id: str, ttl: Optional[float] = None):
+        """Продлевает срок жизни записи после успешной ревалидации (304)"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE vacancies SET expires_at = ?, accessed_at = ? WHERE id = ?",
+                (expires_at, now, str(vacancy_id))
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM vacancies")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
+
+    def _evict(self):
+        """Удаляет давно не использованные записи сверх max_entries"""
+        if not self.max_entries:
+            return
+        count = self._conn.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM vacancies WHERE id IN "
+                "(SELECT id FROM vacancies ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
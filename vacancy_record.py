@@ -0,0 +1,170 @@
+"""Компактная запись вакансии и буфер исходных данных на диске
+
+VacancyRecord хранит только поля, нужные для результатов, статистики и
+файла-спутника (те же, что sidecar.COMPACT_FIELDS), в __slots__ вместо
+словаря: без HTML-описания, логотипов и прочих вложенных объектов API.
+Справочные значения (опыт, график, регион) - общие объекты на все записи.
+Для кода, который работает со словарями вакансий, запись поддерживает
+get(), [] и in.
+
+RawSpillBuffer сохраняет полные исходные данные вакансий во временный файл
+(каждая запись сжата отдельно) и отдает их по ID, когда они нужны.
+"""
+import json
+import os
+import tempfile
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sidecar import COMPACT_FIELDS
+
+# Поля-справочники: {"id": ..., "name": ...}, различных значений немного
+_REFERENCE_FIELDS = ("experience", "schedule", "employment", "area")
+_shared_references: Dict[tuple, dict] = {}
+
+
+def _reference(value) -> Optional[dict]:
+    if not isinstance(value, dict):
+        return None
+    key = (value.get("id"), value.get("name"))
+    shared = _shared_references.get(key)
+    if shared is None:
+        shared = _shared_references.setdefault(key, {"id": key[0], "name": key[1]})
+    return shared
+
+
+def _employer(value) -> Optional[dict]:
+    if not isinstance(value, dict):
+        return None
+    return {"id": value.get("id"), "name": value.get("name")}
+
+
+def _snippet(value) -> Optional[dict]:
+    if not isinstance(value, dict):
+        return None
+    return {"requirement": value.get("requirement"), "responsibility": value.get("responsibility")}
+
+
+class VacancyRecord:
+    """Вакансия в компактном виде; extra - явно запрошенные поля деталей вне основного набора"""
+
+    __slots__ = tuple(COMPACT_FIELDS) + ("extra",)
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_payload(cls,
+                     payload: dict,
+                     details: Optional[dict] = None,
+                     extra_fields: Optional[List[str]] = None) -> "VacancyRecord":
+        """Запись из вакансии поиска (или полной карточки) и, если есть, деталей поверх нее"""
+        source = {**payload, **details} if details else payload
+        skills = source.get("key_skills")
+        extra = {field: source[field] for field in extra_fields or [] if field not in cls.__slots__ and field in source}
+        return cls(
+            id=str(source["id"]) if source.get("id") is not None else None,
+            name=source.get("name"),
+            employer=_employer(source.get("employer")),
+            salary=source.get("salary"),
+            experience=_reference(source.get("experience")),
+            schedule=_reference(source.get("schedule")),
+            employment=_reference(source.get("employment")),
+            key_skills=tuple(skill.get("name") for skill in skills if skill.get("name")) if skills else None,
+            contacts=source.get("contacts"),
+            address=source.get("address"),
+            area=_reference(source.get("area")),
+            published_at=source.get("published_at"),
+            snippet=_snippet(source.get("snippet")),
+            extra=extra or None
+        )
+
+    def get(self, name: str, default=None):
+        if name == "key_skills":
+            value = [{"name": skill} for skill in self.key_skills] if self.key_skills is not None else None
+        elif name in self.__slots__ and name != "extra":
+            value = getattr(self, name)
+        else:
+            value = self.extra.get(name) if self.extra else None
+        return default if value is None else value
+
+    def __getitem__(self, name: str):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def keys(self) -> List[str]:
+        names = [name for name in COMPACT_FIELDS if getattr(self, name) is not None]
+        return names + list(self.extra or ())
+
+    def to_dict(self) -> dict:
+        return {name: self.get(name) for name in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"VacancyRecord(id={self.id!r}, name={self.name!r})"
+
+
+class RawSpillBuffer:
+    """Исходные данные вакансий во временном файле с индексом по ID
+
+    path=None - анонимный временный файл, который удаляется при close().
+    """
+
+    def __init__(self, path: Optional[str] = None, level: int = 6):
+        self.level = level
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, int]] = {}
+        if path:
+            self.path = path
+            self._file = open(path, "w+b")
+        else:
+            fd, self.path = tempfile.mkstemp(prefix="hh_raw_", suffix=".bin")
+            self._file = os.fdopen(fd, "w+b")
+        self._owned = path is None
+
+    def put(self, vacancy_id: str, payload: dict):
+        """Сохраняет данные вакансии; повторная запись с тем же ID заменяет прежнюю"""
+        data = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"), self.level)
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+            self._index[str(vacancy_id)] = (offset, len(data))
+
+    def get(self, vacancy_id: str) -> Optional[dict]:
+        with self._lock:
+            position = self._index.get(str(vacancy_id))
+            if position is None:
+                return None
+            self._file.seek(position[0])
+            data = self._file.read(position[1])
+        return json.loads(zlib.decompress(data))
+
+    def __iter__(self) -> Iterator[Tuple[str, dict]]:
+        for vacancy_id in list(self._index):
+            yield vacancy_id, self.get(vacancy_id)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, vacancy_id: str) -> bool:
+        return str(vacancy_id) in self._index
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._index.clear()
+            if self._owned and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
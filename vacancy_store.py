@@ -0,0 +1,259 @@
+"""Локальное хранилище найденных вакансий с полнотекстовым индексом
+
+Каждый обход HHParser (если у парсера задан store) дописывает сюда
+обработанные вакансии. Таблица vacancies хранит поля для фильтров и сжатые
+данные вакансии (см. sidecar.compact_vacancy), FTS5-индекс vacancies_fts -
+название, сниппет, навыки и работодателя. HHParser.search_offline отвечает
+на запросы по этим данным без обращения к API.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Union
+
+from sidecar import compact_vacancy
+from text_matcher import stem_ru, _CYRILLIC_WORD
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vacancies (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        snippet TEXT,
+        skills TEXT,
+        employer TEXT,
+        area_id TEXT,
+        area TEXT,
+        schedule_id TEXT,
+        experience_id TEXT,
+        salary_from REAL,
+        salary_to REAL,
+        currency TEXT,
+        published_at TEXT,
+        payload TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_vacancies_published ON vacancies (published_at);
+    CREATE INDEX IF NOT EXISTS idx_vacancies_area ON vacancies (area_id, schedule_id);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5(
+        name, snippet, skills, employer,
+        content='vacancies', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 0'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+        INSERT INTO vacancies_fts (rowid, name, snippet, skills, employer)
+        VALUES (new.rowid, new.name, new.snippet, new.skills, new.employer);
+    END;
+    CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+        INSERT INTO vacancies_fts (vacancies_fts, rowid, name, snippet, skills, employer)
+        VALUES ('delete', old.rowid, old.name, old.snippet, old.skills, old.employer);
+    END;
+    CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE ON vacancies BEGIN
+        INSERT INTO vacancies_fts (vacancies_fts, rowid, name, snippet, skills, employer)
+        VALUES ('delete', old.rowid, old.name, old.snippet, old.skills, old.employer);
+        INSERT INTO vacancies_fts (rowid, name, snippet, skills, employer)
+        VALUES (new.rowid, new.name, new.snippet, new.skills, new.employer);
+    END;
+"""
+
+_UPSERT = """
+    INSERT INTO vacancies (id, name, snippet, skills, employer, area_id, area, schedule_id, experience_id,
+                           salary_from, salary_to, currency, published_at, payload, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        name = excluded.name, snippet = excluded.snippet, skills = excluded.skills,
+        employer = excluded.employer, area_id = excluded.area_id, area = excluded.area,
+        schedule_id = excluded.schedule_id, experience_id = excluded.experience_id,
+        salary_from = excluded.salary_from, salary_to = excluded.salary_to, currency = excluded.currency,
+        published_at = excluded.published_at, payload = excluded.payload, updated_at = excluded.updated_at
+"""
+
+
+def _utc(value: Optional[str]) -> Optional[str]:
+    """Дата HH (2024-01-31T12:00:00+0300) или ISO 8601 -> строка UTC, сравнимая как текст"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _name(value) -> Optional[str]:
+    return value.get("name") if isinstance(value, dict) else None
+
+
+def _id(value) -> Optional[str]:
+    return str(value["id"]) if isinstance(value, dict) and value.get("id") is not None else None
+
+
+class VacancyStore:
+    """Вакансии всех обходов в одном файле SQLite с индексом FTS5"""
+
+    def __init__(self, path: str = "vacancies.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def add(self, vacancies: Iterable[dict]) -> int:
+        """Добавляет или обновляет вакансии; поля прежней записи, которых нет в новой, сохраняются"""
+        compact = {}
+        for vacancy in vacancies:
+            if vacancy.get("id") is not None:
+                compact[str(vacancy["id"])] = compact_vacancy(vacancy)
+        if not compact:
+            return 0
+
+        now = time.time()
+        with self._lock:
+            # Страница поиска без деталей не должна затирать сохраненные навыки и контакты
+            previous = self._payloads(list(compact))
+            rows = []
+            for vacancy_id, vacancy in compact.items():
+                merged = {**previous.get(vacancy_id, {}), **vacancy}
+                rows.append(self._row(vacancy_id, merged, now))
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.commit()
+        return len(rows)
+
+    def find(self,
+             keyword: Optional[str] = None,
+             area: Optional[Union[str, int]] = None,
+             schedules: Optional[List[str]] = None,
+             date_from: Optional[str] = None,
+             date_to: Optional[str] = None,
+             with_salary: Optional[bool] = None,
+             experience: Optional[List[str]] = None,
+             morphology: bool = False,
+             limit: Optional[int] = None) -> Iterator[dict]:
+        """Кандидаты по индексу: все слова ключевого слова встречаются в названии или сниппете
+
+        Это грубый отбор; точные правила (фраза целиком, стоп-слова) применяет
+        HHParser.search_offline. area сравнивается точно: вложенные регионы
+        (например, Москва внутри России) не учитываются. schedules - id
+        графиков HH (remote, flexible, fullDay), experience - id опыта.
+        """
+        conditions, params = [], []
+        query = self._fts_query(keyword, morphology) if keyword else None
+        if query:
+            conditions.append("rowid IN (SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?)")
+            params.append(query)
+        if area is not None:
+            conditions.append("area_id = ?")
+            params.append(str(area))
+        if schedules:
+            conditions.append(f"schedule_id IN ({', '.join('?' * len(schedules))})")
+            params.extend(schedules)
+        if date_from:
+            conditions.append("published_at >= ?")
+            params.append(_utc(date_from))
+        if date_to:
+            conditions.append("published_at <= ?")
+            params.append(_utc(date_to))
+        if experience:
+            conditions.append(f"experience_id IN ({', '.join('?' * len(experience))})")
+            params.extend(experience)
+        if with_salary is not None:
+            conditions.append(("" if with_salary else "NOT ")
+                              + "(salary_from IS NOT NULL OR salary_to IS NOT NULL)")
+
+        sql = "SELECT payload FROM vacancies"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY published_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for (payload,) in rows:
+            yield json.loads(payload)
+
+    def get(self, vacancy_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._payloads([str(vacancy_id)]).get(str(vacancy_id))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM vacancies")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
+
+    def __iter__(self) -> Iterator[dict]:
+        """Все вакансии хранилища порциями, не загружая их в память целиком"""
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, payload FROM vacancies WHERE rowid > ? ORDER BY rowid LIMIT 1000", (last_rowid,)
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            for _, payload in rows:
+                yield json.loads(payload)
+
+    def _payloads(self, vacancy_ids: List[str]) -> dict:
+        payloads = {}
+        # SQLite ограничивает число параметров запроса
+        for start in range(0, len(vacancy_ids), 500):
+            batch = vacancy_ids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT id, payload FROM vacancies WHERE id IN ({', '.join('?' * len(batch))})", batch
+            )
+            payloads.update((vacancy_id, json.loads(payload)) for vacancy_id, payload in rows)
+        return payloads
+
+    @staticmethod
+    def _row(vacancy_id: str, vacancy: dict, updated_at: float) -> tuple:
+        snippet = vacancy.get("snippet") or {}
+        salary = vacancy.get("salary") or {}
+        skills = [skill.get("name") for skill in vacancy.get("key_skills") or [] if skill.get("name")]
+        return (
+            vacancy_id,
+            vacancy.get("name"),
+            f"{snippet.get('requirement') or ''} {snippet.get('responsibility') or ''}".strip(),
+            ", ".join(skills),
+            _name(vacancy.get("employer")),
+            _id(vacancy.get("area")),
+            _name(vacancy.get("area")),
+            _id(vacancy.get("schedule")),
+            _id(vacancy.get("experience")),
+            salary.get("from"),
+            salary.get("to"),
+            salary.get("currency"),
+            _utc(vacancy.get("published_at")),
+            json.dumps(vacancy, ensure_ascii=False),
+            updated_at
+        )
+
+    @staticmethod
+    def _fts_query(keyword: str, morphology: bool) -> Optional[str]:
+        """Запрос FTS5: каждое слово ключевого слова в названии или сниппете"""
+        terms = []
+        for token in re.findall(r'\w+', keyword.lower()):
+            if morphology and _CYRILLIC_WORD.match(token):
+                # Как в VacancyMatcher: основа слова и любое окончание
+                terms.append(f'"{stem_ru(token)}"*')
+            else:
+                terms.append(f'"{token}"')
+        if not terms:
+            return None
+        return "{name snippet} : (" + " AND ".join(terms) + ")"